@@ -0,0 +1,310 @@
+"""Persisted cache of answers to repeated questions.
+
+Brain.process looks a question up right after language detection and
+Hinglish normalisation. Entries are keyed by language and the text with
+its spacing normalised; search-style routes fold case and punctuation too
+(canonical text), since the rest answer from the exact words. Each answered route (a direct command name or an NLU intent) has its own
+time-to-live, and routes whose answers change every time (time, date,
+jokes, notes, files...) are never stored. For search-style routes a
+MinHash index over character trigrams also finds near-identical wordings
+("whats the weather in delhi" vs "what is the weather in delhi"); a
+candidate is only reused when its content words match exactly.
+"""
+import os
+import re
+import json
+import time
+import zlib
+import random
+import sqlite3
+import logging
+import threading
+import unicodedata
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger('AnswerCache')
+
+DEFAULT_DB_PATH = os.path.join("data", "answer_cache.sqlite")
+MAX_ENTRIES = 5000
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+# route -> (ttl seconds, near matches allowed). Routes not listed are never cached;
+# direct commands must also be marked cacheable in core.commands.
+ROUTE_POLICY = {
+    "define": (30 * DAY, False),
+    "synonyms": (30 * DAY, False),
+    "antonyms": (30 * DAY, False),
+    "word": (30 * DAY, False),
+    "translate": (30 * DAY, False),
+    "math": (30 * DAY, False),
+    "table": (30 * DAY, False),
+    "convertlength": (30 * DAY, False),
+    "convertweight": (30 * DAY, False),
+    "converttemp": (30 * DAY, False),
+    "dhundo": (DAY, True),
+    "search": (DAY, True),
+}
+# Search answers that go stale faster than a day
+SEARCH_TTL_OVERRIDES = (
+    (re.compile(r'\b(news|samachar|khabar|समाचार|खबर)\b'), 10 * MINUTE),
+    (re.compile(r'\b(weather|mausam|temperature|forecast|मौसम)\b'), 30 * MINUTE),
+    (re.compile(r'\b(price|rate|bhav|daam|cost|value|worth)\b'), 30 * MINUTE),
+)
+# Error, prompt and "nothing found" responses must not be replayed. Matched against
+# the start of the whole response, so answers that merely mention "error" still cache.
+FAILURE_PREFIXES = ("❌", "⚠️", "usage:", "error executing command", "please specify", "please provide",
+                    "could not", "cannot", "unsupported", "no relevant results", "search took too long",
+                    "search service", "dictionary service", "translation service")
+
+NUM_PERM = 32
+BANDS = 16  # 2 rows per band: pairs at trigram Jaccard 0.5 still collide ~99% of the time
+ROWS = NUM_PERM // BANDS
+NEAR_THRESHOLD = 0.5  # trigram Jaccard needed to consider another wording
+# Words that don't change what is being asked
+FILLER_WORDS = frozenset("""
+    a an the is are was what whats tell me about of in on for show give latest current
+    today now kya hai ka ki ke batao bata do
+""".split())
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1337)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+WAKE_WORDS = re.compile(r'^(?:(?:hey|ok|mini|please)\s+)+|(?:\s+(?:please|mini))+$')
+
+
+def canonicalize(text: str) -> str:
+    """Case-, punctuation- and spacing-insensitive form of an utterance"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = re.sub(r"['`]", '', text)
+    text = re.sub(r'[?!",;:]+', ' ', text)
+    text = re.sub(r'\.(?=\s|$)', ' ', text)  # sentence dots, not decimal points
+    text = ' '.join(text.split())
+    return WAKE_WORDS.sub('', text).strip()
+
+
+def exact_key(text: str) -> str:
+    """Spacing-insensitive form of an utterance, for routes whose answer depends on its wording"""
+    return ' '.join(text.split())
+
+
+def key_for(route: str, text: str) -> str:
+    """Cache key of text when answered via route"""
+    return canonicalize(text) if ROUTE_POLICY.get(route, (0, False))[1] else exact_key(text)
+
+
+def _trigrams(text: str):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _content_words(text: str) -> frozenset:
+    return frozenset(word for word in text.split() if word not in FILLER_WORDS)
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def _minhash(grams) -> Tuple[int, ...]:
+    hashes = [zlib.crc32(g.encode('utf-8')) for g in grams]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def _bands(signature):
+    return [(i, signature[i * ROWS:(i + 1) * ROWS]) for i in range(BANDS)]
+
+
+def ttl_for(route: str, key: str) -> int:
+    """Seconds an answer given via route may be reused; 0 means never cache"""
+    ttl, _ = ROUTE_POLICY.get(route, (0, False))
+    if ttl and route in ("dhundo", "search"):
+        for pattern, override in SEARCH_TTL_OVERRIDES:
+            if pattern.search(key):
+                return override
+    return ttl
+
+
+def is_cacheable(response: Any) -> bool:
+    """Whether response is a real answer worth replaying.
+
+    Search results say so explicitly: real ones carry a source, and ones
+    served from the refresh snapshot carry an age (they are already local,
+    and their "updated N min ago" label must not be frozen).
+    """
+    if not response:
+        return False
+    if isinstance(response, list):
+        return all(isinstance(r, dict) and r.get("source") and "age" not in r for r in response)
+    if isinstance(response, str):
+        return not response.strip().lower().startswith(FAILURE_PREFIXES)
+    return True
+
+
+class AnswerCache:
+    """SQLite-backed answer cache with an in-memory MinHash LSH index"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_entries: int = MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS answers (
+                lang TEXT NOT NULL,
+                key TEXT NOT NULL,
+                route TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                expires REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (lang, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_answers_expires ON answers(expires);
+        ''')
+        self.conn.commit()
+        self.counters = {"lookups": 0, "hits": 0, "near_hits": 0, "stores": 0}
+        self._buckets: Dict[tuple, set] = {}
+        self._signatures: Dict[tuple, Tuple[int, ...]] = {}
+        self._load_index()
+
+    # ---------------- NEAR-MATCH INDEX ----------------
+    def _load_index(self):
+        routes = tuple(ROUTE_POLICY)
+        with self._lock, self.conn:
+            # Routes dropped from the policy must stop answering, not wait out their TTL
+            self.conn.execute(f"DELETE FROM answers WHERE expires <= ? OR route NOT IN ({','.join('?' * len(routes))})",
+                              (time.time(),) + routes)
+            rows = self.conn.execute("SELECT lang, key, route FROM answers").fetchall()
+        for lang, key, route in rows:
+            if ROUTE_POLICY[route][1]:
+                self._index(lang, key)
+
+    def _index(self, lang: str, key: str):
+        entry = (lang, key)
+        if entry in self._signatures:
+            return
+        signature = _minhash(_trigrams(key))
+        self._signatures[entry] = signature
+        for band in _bands(signature):
+            self._buckets.setdefault((lang,) + band, set()).add(key)
+
+    def _unindex(self, lang: str, key: str):
+        signature = self._signatures.pop((lang, key), None)
+        if signature is None:
+            return
+        for band in _bands(signature):
+            bucket = self._buckets.get((lang,) + band)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[(lang,) + band]
+
+    def _near_keys(self, lang: str, key: str):
+        """Indexed keys with the same content words and trigram Jaccard >= NEAR_THRESHOLD, best first"""
+        grams = _trigrams(key)
+        candidates = set()
+        for band in _bands(_minhash(grams)):
+            candidates |= self._buckets.get((lang,) + band, set())
+        words = _content_words(key)
+        scored = [(_jaccard(grams, _trigrams(other)), other) for other in candidates
+                  if _content_words(other) == words]
+        return [other for score, other in sorted(scored, reverse=True) if score >= NEAR_THRESHOLD]
+
+    # ---------------- LOOKUP ----------------
+    def _fetch(self, lang: str, key: str, near_only: bool = False):
+        row = self.conn.execute(
+            "SELECT response, expires, route FROM answers WHERE lang = ? AND key = ?", (lang, key)
+        ).fetchone()
+        if row is None or (near_only and not ROUTE_POLICY.get(row[2], (0, False))[1]):
+            return None
+        if row[1] <= time.time():
+            with self.conn:
+                self.conn.execute("DELETE FROM answers WHERE lang = ? AND key = ?", (lang, key))
+            self._unindex(lang, key)
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE answers SET hits = hits + 1 WHERE lang = ? AND key = ?", (lang, key))
+        return json.loads(row[0])
+
+    def get(self, text: str, lang: str) -> Optional[Any]:
+        """Cached answer for text (exact or near wording), or None"""
+        exact, key = exact_key(text), canonicalize(text)
+        if not exact:
+            return None
+        with self._lock:
+            self.counters["lookups"] += 1
+            response = self._fetch(lang, exact)
+            if response is None and key and key != exact:
+                # Search-style answers are stored under the canonical text
+                response = self._fetch(lang, key, near_only=True)
+            if response is not None:
+                self.counters["hits"] += 1
+                return response
+            for other in (self._near_keys(lang, key) if key else ()):
+                response = self._fetch(lang, other)
+                if response is not None:
+                    logger.info(f"Near match: '{key}' answered from '{other}'")
+                    self.counters["hits"] += 1
+                    self.counters["near_hits"] += 1
+                    return response
+        return None
+
+    # ---------------- STORE ----------------
+    def put(self, text: str, lang: str, route: str, response: Any) -> bool:
+        """Store response if the route's policy and the response allow it"""
+        key = key_for(route, text)
+        ttl = ttl_for(route, key) if key else 0
+        if not ttl or not is_cacheable(response):
+            return False
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO answers (lang, key, route, response, created, expires) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (lang, key, route, json.dumps(response, ensure_ascii=False), now, now + ttl)
+                )
+            if ROUTE_POLICY[route][1]:
+                self._index(lang, key)
+            self.counters["stores"] += 1
+            if self.counters["stores"] % 100 == 0:
+                self._prune()
+        return True
+
+    def _prune(self):
+        """Drop expired entries, then the least-used ones beyond max_entries"""
+        with self.conn:
+            self.conn.execute("DELETE FROM answers WHERE expires <= ?", (time.time(),))
+            self.conn.execute('''
+                DELETE FROM answers WHERE (lang, key) IN (
+                    SELECT lang, key FROM answers ORDER BY hits DESC, created DESC
+                    LIMIT -1 OFFSET ?
+                )''', (self.max_entries,))
+        live = set(self.conn.execute("SELECT lang, key FROM answers").fetchall())
+        for entry in [e for e in self._signatures if e not in live]:
+            self._unindex(*entry)
+
+    def invalidate(self, route: Optional[str] = None) -> int:
+        """Forget cached answers for one route, or all of them"""
+        with self._lock, self.conn:
+            if route:
+                cur = self.conn.execute("DELETE FROM answers WHERE route = ?", (route,))
+            else:
+                cur = self.conn.execute("DELETE FROM answers")
+            self._signatures.clear()
+            self._buckets.clear()
+        self._load_index()
+        return cur.rowcount
+
+    # ---------------- STATS ----------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            result = dict(self.counters, entries=entries)
+        lookups = result["lookups"]
+        result["hit_rate"] = result["hits"] / lookups if lookups else 0.0
+        return result
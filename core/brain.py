@@ -4,14 +4,15 @@ import re
 import random
 import requests
 import logging
+import threading
 from datetime import datetime
 from typing import Optional
 from utils.language_utils import detect_language, normalize_hinglish
 from utils.personality import shape_response
 from core.nlu import NLU
-from tools import offline_tools
-from tools.search_engine_2 import api_search
-from tools.dictionary import DictionaryTool
+from core.answer_cache import AnswerCache, is_cacheable
+from core import commands
+from core.commands import UsageError
 
 # Initialize logging
 logging.basicConfig(
@@ -39,69 +40,38 @@ class Brain:
         }
         self.memory = self.load_memory()
         self.nlu = NLU()
-        self.dictionary = DictionaryTool()
+        self.answer_cache = AnswerCache()
+        self._route = None
+        # Heavy tools are created on first use (see the properties below)
+        self._dictionary = None
+        self._search_engine = None
         
-        # Initialize search engines
-        self.search_engine = api_search
-        
-        # Direct command mappings (word -> function)
-        self.command_mappings = {
-            # Date & Time
-            "time": offline_tools.current_time,
-            "date": offline_tools.current_date,
-            "day": offline_tools.day_of_week,
-            
-            # Math
-            "math": offline_tools.simple_math,
-            "calculate": offline_tools.simple_math,
-            
-            # File Operations
-            "read": offline_tools.read_file,
-            "write": offline_tools.write_file,
-            "append": offline_tools.append_file,
-            "stats": offline_tools.file_stats,
-            "searchfile": offline_tools.search_in_file,
-            
-            # Random & Fun
-            "random": offline_tools.random_number,
-            "choice": offline_tools.random_choice,
-            "coin": offline_tools.coin_toss,
-            "dice": offline_tools.dice_roll,
-            "fact": offline_tools.random_fact,
-            
-            # Text Utilities
-            "count": offline_tools.word_count,
-            "reverse": offline_tools.reverse_text,
-            "capitalize": offline_tools.capitalize_text,
-            "replace": offline_tools.search_and_replace,
-            
-            # Timer
-            "timer": offline_tools.set_timer,
-            
-            # Unit Conversion
-            "convertlength": lambda args: offline_tools.convert_length(*args.split()),
-            "convertweight": lambda args: offline_tools.convert_weight(*args.split()),
-            "converttemp": lambda args: offline_tools.convert_temperature(*args.split()),
-            
-            # Notes
-            "addnote": offline_tools.add_note,
-            "readnotes": offline_tools.read_notes,
-            "deletenotes": offline_tools.delete_notes,
-            
-            # Dictionary
-            "define": self.handle_define,
-            "synonyms": self.handle_synonyms,
-            "antonyms": self.handle_antonyms,
-            "translate": self.handle_translate,
-            
-            # Help
-            "help": offline_tools.mini_help,
-            "about": offline_tools.about_mini,
-            
-            # Special commands
-            "dhundo": self.handle_dhundo_command
-        }
+        # Keep joke/fact buffers topped up; the offline tools load off the startup path
+        threading.Thread(target=lambda: commands.load(f"{commands.OFFLINE}:start_prefetch")(),
+                         name="prefetch-start", daemon=True).start()
+        # Optional news/weather snapshot refresh (MINI_SNAPSHOT_REFRESH=1)
+        if os.getenv("MINI_SNAPSHOT_REFRESH", "0") == "1":
+            from tools.search_engine_2 import start_snapshot_refresh
+            start_snapshot_refresh()
+        # Optional seed-site recrawling to keep the search index warm (MINI_RECRAWL=1)
+        if os.getenv("MINI_RECRAWL", "0") == "1":
+            from tools.search_engine import mini_integration
+            mini_integration.start_background_recrawl()
         
+    @property
+    def dictionary(self):
+        if self._dictionary is None:
+            from tools.dictionary import DictionaryTool
+            self._dictionary = DictionaryTool()
+        return self._dictionary
+    
+    @property
+    def search_engine(self):
+        if self._search_engine is None:
+            from tools.search_engine_2 import api_search
+            self._search_engine = api_search
+        return self._search_engine
+    
     def load_memory(self):
         if os.path.exists(self.memory_path):
             try:
@@ -128,20 +98,32 @@ class Brain:
         self.save_memory()
     
     def handle_direct_command(self, command: str, args: str) -> Optional[str]:
-        """Handle direct commands using the command mapping"""
-        if command in self.command_mappings:
-            try:
-                func = self.command_mappings[command]
-                if callable(func):
-                    if args:
-                        return func(args)  # function with arguments
-                    return func()        # function without arguments
-                return "Command not implemented properly"
-            except Exception as e:
-                logger.error(f"Error executing command '{command}': {e}")
-                return f"Error executing command: {e}"
-        return None
+        """Handle direct commands using the command registry"""
+        entry = commands.lookup(command)
+        if entry is None:
+            return None
+        try:
+            return entry.run(args, self)
+        except UsageError:
+            return f"Usage: {entry.usage}"
+        except Exception as e:
+            logger.error(f"Error executing command '{command}': {e}")
+            return f"Error executing command: {e}"
         
+    def handle_cachestats(self, args: str = "") -> str:
+        """Report answer cache hit rate for this session and overall"""
+        if args.strip().lower() == "clear":
+            removed = self.answer_cache.invalidate()
+            return f"Answer cache cleared ({removed} entries)"
+        stats = self.answer_cache.stats()
+        totals = self.memory.get("stats", {})
+        hits, misses = totals.get('answer_cache_hits', 0), totals.get('answer_cache_misses', 0)
+        overall = hits / (hits + misses) if hits + misses else 0.0
+        return (f"Answer cache: {stats['entries']} entries\n"
+                f"This session: {stats['hits']}/{stats['lookups']} hits ({stats['hit_rate']:.0%}), "
+                f"{stats['near_hits']} near matches\n"
+                f"Overall: {hits}/{hits + misses} hits ({overall:.0%})")
+    
     def handle_dhundo_command(self, args: str) -> str:
         """Handle 'dhundo' command using search_engine_2"""
         if not args:
@@ -186,6 +168,17 @@ class Brain:
             logger.error(f"Antonym error: {e}")
             return "Could not fetch antonyms at this time"
     
+    def handle_word(self, args: str) -> str:
+        """Handle combined definition/synonyms/antonyms requests"""
+        if not args:
+            return "Please specify a word to look up"
+        self.touch_stat('word_card_requests')
+        try:
+            return self.dictionary.lookup_all(args)
+        except Exception as e:
+            logger.error(f"Word card error: {e}")
+            return "Dictionary service is currently unavailable"
+    
     def handle_translate(self, args: str) -> str:
         """Handle translation requests with flexible syntax"""
         if not args:
@@ -233,6 +226,22 @@ class Brain:
             user_text = normalize_hinglish(user_text)
             logger.info(f"Normalized Hinglish: {user_text}")
         
+        # Repeated questions skip NLU and the network
+        cached = self.answer_cache.get(user_text, lang)
+        if cached is not None:
+            self.touch_stat('answer_cache_hits')
+            self.context['last_user'] = user_text
+            return cached
+        self.touch_stat('answer_cache_misses')
+        
+        self._route = None
+        response = self._answer(user_text, original_text, lang)
+        if self._route:
+            self.answer_cache.put(user_text, lang, self._route, response)
+        return response
+    
+    def _answer(self, user_text: str, original_text: str, lang: str):
+        """Run the full pipeline; sets self._route to the command or intent that answered"""
         # Create lowercase version for intent detection
         user_text_lower = user_text.lower()
         
@@ -243,16 +252,20 @@ class Brain:
             args = parts[1] if len(parts) > 1 else ""
             direct_response = self.handle_direct_command(command, args)
             if direct_response:
+                entry = commands.lookup(command)
+                self._route = entry.name if entry.cacheable else None
                 return direct_response
         
         # Try natural language handler for direct commands
-        natural_response = offline_tools.handle_natural_query(user_text)
+        natural_response = commands.load(f"{commands.OFFLINE}:handle_natural_query")(user_text)
         if natural_response:
+            self._route = 'natural'
             return natural_response
         
         # Intent recognition
         intent = self.nlu.detect_intent(user_text, lang)
         logger.info(f"Detected intent: {intent} for text: {user_text}")
+        self._route = intent
         
         # Update context
         self.context['last_user'] = user_text
@@ -337,6 +350,8 @@ class Brain:
                     
                     if formatted_results:
                         self.touch_stat('search_success')
+                        if not is_cacheable(results):
+                            self._route = None
                         response = "Here's what I found:\n\n" + "\n".join(formatted_results)
                         return shape_response(response, lang, self.context)
                     
@@ -352,6 +367,7 @@ class Brain:
                 return "Search service is currently unavailable. Please try again later."
         
         # ---------------- FALLBACK ----------------
+        self._route = None
         self.touch_stat('fallback_responses')
         fallbacks = {
             'en': "I'm still learning, could you rephrase?",
@@ -364,40 +380,23 @@ class Brain:
         """
         Stores data from provided links into a folder inside 'data/'.
         If folder exists, use it. Otherwise, create it.
-        Each link's data is stored as a separate JSON file with a sanitized filename.
+        Links are downloaded concurrently and stored compressed under
+        objects/, with manifest.json recording url, hash, size and fetch time.
+        Unchanged pages are not written again.
         """
-        base_path = "data"
-        target_path = os.path.join(base_path, folder_name)
-        
-        # Ensure target folder exists
-        os.makedirs(target_path, exist_ok=True)
-        
-        saved_files = []
-        
-        for idx, url in enumerate(links, start=1):
-            try:
-                response = requests.get(url, timeout=10)
-                if response.status_code == 200:
-                    content = response.text
-                    
-                    # Generate safe filename
-                    filename = f"link_{idx}.json"
-                    file_path = os.path.join(target_path, filename)
-                    
-                    # Save content as JSON
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        json.dump({
-                            "url": url,
-                            "content": content
-                        }, f, indent=2, ensure_ascii=False)
-                    
-                    saved_files.append(filename)
-                else:
-                    logger.warning(f"Failed to fetch URL {url}: Status {response.status_code}")
-            except Exception as e:
-                logger.error(f"Error fetching URL {url}: {e}")
-        
-        if saved_files:
-            return f"Data stored in folder '{folder_name}': {', '.join(saved_files)}"
+        from tools.link_store import LinkStore
+        target_path = os.path.join("data", folder_name)
+        results = LinkStore(target_path).store(links)
+        stored, unchanged = results["stored"], results["unchanged"]
+
+        if stored or unchanged:
+            parts = []
+            if stored:
+                parts.append(f"{len(stored)} stored")
+            if unchanged:
+                parts.append(f"{len(unchanged)} unchanged")
+            if results["failed"]:
+                parts.append(f"{len(results['failed'])} failed")
+            return f"Data stored in folder '{folder_name}': {', '.join(parts)}"
         else:
             return "No data was stored, all URLs failed."
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""Declarative table of Mini's direct commands.
+
+Each Command names its handler either as "module:function" (imported on
+first use, so optional tools cost nothing until called) or as a Brain
+method. An argument parser turns the raw argument string into the
+handler's positional arguments, raising UsageError when they don't fit.
+`cacheable` marks commands whose answer only depends on their input, so
+Brain may store it in the answer cache.
+"""
+import re
+import sys
+import importlib
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger('Commands')
+
+
+class UsageError(ValueError):
+    """Arguments don't match the command's usage line"""
+
+
+# ---------------- ARGUMENT PARSERS ----------------
+def no_args(args: str) -> Tuple:
+    return ()
+
+
+def text(args: str) -> Tuple:
+    """Whole argument string, possibly empty (handler prompts for input)"""
+    return (args,)
+
+
+def required_text(args: str) -> Tuple:
+    if not args.strip():
+        raise UsageError()
+    return (args.strip(),)
+
+
+def split_args(count: int) -> Callable[[str], Tuple]:
+    """Exactly `count` whitespace-separated arguments; the last keeps its spaces"""
+    def parse(args: str) -> Tuple:
+        parts = args.split(maxsplit=count - 1)
+        if len(parts) != count:
+            raise UsageError()
+        return tuple(parts)
+    return parse
+
+
+READ_SPEC = re.compile(r'^(.*?)\s+((?:head|tail)(?:\s+\d+)?|\d+\s*-\s*\d+)$', re.IGNORECASE)
+
+
+def file_and_range(args: str) -> Tuple:
+    """A file name optionally followed by 'head N', 'tail N' or 'start-end'"""
+    args = args.strip()
+    if not args:
+        raise UsageError()
+    match = READ_SPEC.match(args)
+    return match.groups() if match else (args,)
+
+
+def int_range(args: str) -> Tuple:
+    """Nothing, or a start and end integer"""
+    parts = args.split()
+    if not parts:
+        return ()
+    try:
+        start, end = map(int, parts)
+    except ValueError:
+        raise UsageError()
+    return (start, end)
+
+
+def comma_list(args: str) -> Tuple:
+    items = [item.strip() for item in args.split(',') if item.strip()]
+    if not items:
+        raise UsageError()
+    return (items,)
+
+
+def timer_args(args: str) -> Tuple:
+    parts = args.split(maxsplit=1)
+    if not parts or not parts[0].isdigit():
+        raise UsageError()
+    return (int(parts[0]), parts[1] if len(parts) > 1 else "Time's up!")
+
+
+def conversion_args(args: str) -> Tuple:
+    parts = args.split()
+    if len(parts) != 3:
+        raise UsageError()
+    try:
+        value = float(parts[0])
+    except ValueError:
+        raise UsageError()
+    return (value, parts[1], parts[2])
+
+
+def conversion_result(result) -> str:
+    return f"Result: {result:g}" if result is not None else "Unsupported units"
+
+
+# ---------------- COMMAND ----------------
+@lru_cache(maxsize=None)
+def load(target: str) -> Callable:
+    """Function named by "module:function", importing its module on first use"""
+    module_name, func_name = target.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+class Command:
+    __slots__ = ("name", "aliases", "target", "method", "parse", "cacheable", "usage", "render")
+
+    def __init__(self, name: str, target: Optional[str] = None, method: Optional[str] = None,
+                 parse: Callable[[str], Tuple] = no_args, aliases: Tuple[str, ...] = (),
+                 cacheable: bool = False, usage: Optional[str] = None,
+                 render: Optional[Callable] = None):
+        if (target is None) == (method is None):
+            raise ValueError(f"Command '{name}' needs exactly one of target or method")
+        self.name = sys.intern(name)
+        self.aliases = tuple(sys.intern(alias) for alias in aliases)
+        self.target = target
+        self.method = method
+        self.parse = parse
+        self.cacheable = cacheable
+        self.usage = usage or name
+        self.render = render
+
+    def resolve(self, brain=None) -> Callable:
+        """Handler function, importing its module on first use"""
+        if self.method is not None:
+            return getattr(brain, self.method)
+        return load(self.target)
+
+    def run(self, args: str, brain=None):
+        """Parse args and call the handler; UsageError propagates to the caller"""
+        result = self.resolve(brain)(*self.parse(args))
+        return self.render(result) if self.render else result
+
+
+OFFLINE = "tools.offline_tools"
+
+COMMANDS = (
+    # Date & Time
+    Command("time", f"{OFFLINE}:current_time"),
+    Command("date", f"{OFFLINE}:current_date"),
+    Command("day", f"{OFFLINE}:day_of_week"),
+
+    # Math
+    Command("math", f"{OFFLINE}:simple_math", parse=required_text, aliases=("calculate",),
+            cacheable=True, usage="math <expression> [for x in <start>..<end> [step s]]"),
+    Command("table", f"{OFFLINE}:math_table", parse=required_text, cacheable=True,
+            usage="table <expression> for x in <start>..<end> [step s]"),
+
+    # File Operations
+    Command("read", f"{OFFLINE}:read_file", parse=file_and_range,
+            usage="read <file> [head N | tail N | start-end]"),
+    Command("write", f"{OFFLINE}:write_file", parse=split_args(2), usage="write <file> <text>"),
+    Command("append", f"{OFFLINE}:append_file", parse=split_args(2), usage="append <file> <text>"),
+    Command("stats", f"{OFFLINE}:file_stats", parse=required_text, usage="stats <file>"),
+    Command("searchfile", f"{OFFLINE}:search_in_file", parse=split_args(2),
+            usage="searchfile <file> <keywords | /regex/>"),
+    Command("findall", f"{OFFLINE}:find_all", parse=required_text, usage="findall <keywords>"),
+
+    # Random & Fun
+    Command("random", f"{OFFLINE}:random_number", parse=int_range, usage="random [start end]"),
+    Command("choice", f"{OFFLINE}:random_choice", parse=comma_list, usage="choice <a, b, c>"),
+    Command("coin", f"{OFFLINE}:coin_toss"),
+    Command("dice", f"{OFFLINE}:dice_roll"),
+    Command("fact", f"{OFFLINE}:random_fact"),
+    Command("joke", f"{OFFLINE}:random_joke"),
+
+    # Text Utilities
+    # Not cacheable: their output is the input itself, which the cache key folds
+    Command("count", f"{OFFLINE}:word_count", parse=required_text, usage="count <text>"),
+    Command("reverse", f"{OFFLINE}:reverse_text", parse=required_text, usage="reverse <text>"),
+    Command("capitalize", f"{OFFLINE}:capitalize_text", parse=required_text, usage="capitalize <text>"),
+    Command("replace", f"{OFFLINE}:search_and_replace", parse=split_args(3),
+            usage="replace <text> <search> <replace>"),
+
+    # Timer
+    Command("timer", f"{OFFLINE}:set_timer", parse=timer_args, usage="timer <seconds> [message]"),
+    Command("reminders", f"{OFFLINE}:list_reminders", aliases=("timers",)),
+    Command("cancel", f"{OFFLINE}:cancel_reminder", parse=required_text, usage="cancel <id>"),
+
+    # Unit Conversion
+    Command("convertlength", f"{OFFLINE}:convert_length", parse=conversion_args, cacheable=True,
+            usage="convertlength <value> <cm|inch> <cm|inch>", render=conversion_result),
+    Command("convertweight", f"{OFFLINE}:convert_weight", parse=conversion_args, cacheable=True,
+            usage="convertweight <value> <kg|lb> <kg|lb>", render=conversion_result),
+    Command("converttemp", f"{OFFLINE}:convert_temperature", parse=conversion_args, cacheable=True,
+            usage="converttemp <value> <c|f> <c|f>", render=conversion_result),
+
+    # Notes
+    Command("addnote", f"{OFFLINE}:add_note", parse=required_text, usage="addnote <text>"),
+    Command("readnotes", f"{OFFLINE}:read_notes", parse=text, usage="readnotes [older-than-id]"),
+    Command("searchnotes", f"{OFFLINE}:search_notes", parse=required_text, usage="searchnotes <words>"),
+    Command("deletenote", f"{OFFLINE}:delete_note", parse=required_text, usage="deletenote <id>"),
+    Command("deletenotes", f"{OFFLINE}:delete_notes"),
+
+    # Dictionary
+    Command("define", method="handle_define", parse=text, cacheable=True),
+    Command("synonyms", method="handle_synonyms", parse=text, cacheable=True),
+    Command("antonyms", method="handle_antonyms", parse=text, cacheable=True),
+    Command("word", method="handle_word", parse=text, cacheable=True),
+    Command("translate", method="handle_translate", parse=text, cacheable=True),
+
+    # Answer cache
+    Command("cachestats", method="handle_cachestats", parse=text),
+
+    # Help
+    Command("help", f"{OFFLINE}:mini_help"),
+    Command("about", f"{OFFLINE}:about_mini"),
+
+    # Special commands
+    Command("dhundo", method="handle_dhundo_command", parse=text, cacheable=True),
+)
+
+
+def _build_registry(commands) -> Dict[str, Command]:
+    registry = {}
+    for command in commands:
+        for key in (command.name,) + command.aliases:
+            if key in registry:
+                raise ValueError(f"Duplicate command name '{key}'")
+            registry[key] = command
+    return registry
+
+
+REGISTRY = _build_registry(COMMANDS)
+
+
+def lookup(word: str) -> Optional[Command]:
+    """Command registered under word (name or alias), or None"""
+    return REGISTRY.get(word.lower())
@@ -146,6 +146,8 @@ class ChatBox(BoxLayout):
         super().__init__(**kwargs)
         self.msg_queue = queue.Queue()
         self.mini = Mini()
+        self.mini.reminders.subscribe(self.on_reminder)
+        self.mini.reminders.start()  # only now, so overdue reminders also reach the chat
 
         # Start background threads
         Thread(target=self.background_task, daemon=True).start()
@@ -191,6 +193,10 @@ class ChatBox(BoxLayout):
                     self.msg_queue.put(spoken_text)
             time.sleep(0.1)
 
+    def on_reminder(self, reminder):
+        """Show a due reminder as a chat bubble (called off the UI thread)"""
+        Clock.schedule_once(lambda dt: self.add_bubble(f"⏰ Reminder: {reminder.message}", sender="mini"))
+
     def add_bubble(self, message, sender="mini"):
         bubble = ChatBubble(text=message, sender=sender)
         self.ids.chat_output.add_widget(bubble)
@@ -6,6 +6,7 @@ import queue
 import threading
 
 from core.brain import Brain
+from tools.reminders import get_scheduler
 
 # Optional: TTS setup
 try:
@@ -61,6 +62,12 @@ class Mini:
         self.running = True
         self.stt_queue = queue.Queue()
 
+        # Deliver timers/reminders here (and to any UI that subscribes). The
+        # frontend starts the scheduler once every subscriber is registered, so
+        # reminders that fell due while Mini was off reach all of them.
+        self.reminders = get_scheduler()
+        self.reminders.subscribe(self.on_reminder)
+
         # Setup STT if available
         self.stt_model = None
         if HAS_STT:
@@ -86,6 +93,15 @@ class Mini:
             engine.say(text)
             engine.runAndWait()
 
+    def on_reminder(self, reminder):
+        """Announce a due reminder; runs on the reminder thread"""
+        text = f"Reminder: {reminder.message}"
+        if reminder.late:
+            text += " (missed while Mini was off)"
+        print(f"\n[Mini] ⏰ {text}")
+        if self.use_tts and self.voice_mode:
+            self.speak(text)
+
     def get_response(self, text: str) -> str:
         """Generate response using Brain"""
         try:
@@ -111,6 +127,7 @@ class Mini:
 
     def run(self):
         """Unified mode: text by default, toggle voice with commands"""
+        self.reminders.start()
         print("\n[Mini] Running in Text Mode. Type or say 'mini voice mode on' to enable voice.\n")
 
         while self.running:
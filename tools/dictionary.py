@@ -1,12 +1,91 @@
 import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
 import requests
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
+from tools.lexicon_store import LexiconStore, normalize_word
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('DictionaryTool')
 
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?।])\s+')
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation"""
+    return [s for s in SENTENCE_SPLIT.split(text.strip()) if s]
+
+def normalize_segment(segment: str) -> str:
+    """Canonical form of a segment used for translation-memory keys"""
+    return " ".join(unicodedata.normalize("NFC", segment).split())
+
+class TranslationMemory:
+    """SQLite-backed cache of translated segments keyed by (source, target, hash)"""
+    def __init__(self, db_path: str = os.path.join("data", "translation_memory.sqlite")):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                seg_hash TEXT NOT NULL,
+                segment TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created REAL NOT NULL,
+                PRIMARY KEY (source, target, seg_hash)
+            ) WITHOUT ROWID
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def key(segment: str) -> str:
+        return hashlib.sha1(normalize_segment(segment).encode("utf-8")).hexdigest()
+
+    def get_many(self, source: str, target: str, segments: List[str]) -> Dict[str, str]:
+        """Return {seg_hash: translation} for the segments already in memory"""
+        hashes = list({self.key(seg) for seg in segments})
+        if not hashes:
+            return {}
+        placeholders = ",".join("?" * len(hashes))
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT seg_hash, translation FROM translations "
+                f"WHERE source = ? AND target = ? AND seg_hash IN ({placeholders})",
+                [source, target, *hashes]
+            ).fetchall()
+        return dict(rows)
+
+    def put_many(self, source: str, target: str, pairs: List[tuple]):
+        """Store (segment, translation) pairs in one transaction"""
+        now = time.time()
+        rows = [(source, target, self.key(seg), normalize_segment(seg), tr, now) for seg, tr in pairs]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+def _dedupe(words: List[str], exclude: str = "") -> List[str]:
+    """Order-preserving, case-insensitive de-duplication"""
+    seen = {exclude} if exclude else set()
+    unique = []
+    for w in words:
+        k = w.strip().lower()
+        if k and k not in seen:
+            seen.add(k)
+            unique.append(w.strip())
+    return unique
+
 class DictionaryTool:
     def __init__(self):
         self.dict_api = "https://api.dictionaryapi.dev/api/v2/entries/en/"
@@ -14,6 +93,12 @@ class DictionaryTool:
         self.translate_api = "https://libretranslate.com/translate"
         self.languages_api = "https://libretranslate.com/languages"
         self.supported_languages = self._load_supported_languages()
+        self.translation_memory = TranslationMemory()
+        self.lexicon = LexiconStore()
+        self._executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix="dictionary")
+        self._card_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._card_cache_size = 256
+        self._card_lock = threading.Lock()
 
     def _load_supported_languages(self) -> Dict[str, str]:
         """Load supported languages with caching"""
@@ -35,40 +120,11 @@ class DictionaryTool:
         if not word:
             return "❌ Please provide a word to define."
             
-        url = f"{self.dict_api}{word}"
         try:
-            response = requests.get(url, timeout=5)
-            if response.status_code != 200:
+            data = self._get_entry(word)
+            if data is None:
                 return f"❌ No definition found for '{word}'."
-
-            data = response.json()[0]
-            output = [f"📖 Word: {data.get('word', word)}"]
-
-            # Extract phonetics
-            phonetics = [p.get("text") for p in data.get("phonetics", []) if p.get("text")]
-            if phonetics:
-                output.append(f"🔊 Pronunciation: {', '.join(phonetics)}")
-
-            # Extract meanings
-            for meaning in data.get("meanings", []):
-                part = meaning.get("partOfSpeech", "")
-                output.append(f"\n➡️ {part.capitalize()}:")
-                
-                for idx, definition in enumerate(meaning.get("definitions", []), 1):
-                    def_text = definition.get("definition", "")
-                    example = definition.get("example", "")
-                    syns = ", ".join(definition.get("synonyms", []))
-                    ants = ", ".join(definition.get("antonyms", []))
-                    
-                    output.append(f"   {idx}. {def_text}")
-                    if example:
-                        output.append(f"      Example: {example}")
-                    if syns:
-                        output.append(f"      Synonyms: {syns}")
-                    if ants:
-                        output.append(f"      Antonyms: {ants}")
-
-            return "\n".join(output)
+            return self._format_entry(data, word)
 
         except requests.RequestException:
             return "❌ Network error. Please check your connection and try again."
@@ -76,17 +132,70 @@ class DictionaryTool:
             logger.error(f"Error defining word: {e}")
             return f"⚠️ Error: {str(e)}"
 
+    def _get_entry(self, word: str) -> Optional[Dict]:
+        """Dictionary entry from the local store, falling back to dictionaryapi.dev"""
+        data = self.lexicon.get_entry(word)
+        if data is not None:
+            return data
+        
+        response = requests.get(f"{self.dict_api}{word}", timeout=5)
+        if response.status_code != 200:
+            return None
+        data = response.json()[0]
+        self.lexicon.put_entry(word, data)
+        return data
+
+    def _format_entry(self, data: Dict, word: str) -> str:
+        output = [f"📖 Word: {data.get('word', word)}"]
+
+        # Extract phonetics
+        phonetics = [p.get("text") for p in data.get("phonetics", []) if p.get("text")]
+        if phonetics:
+            output.append(f"🔊 Pronunciation: {', '.join(phonetics)}")
+
+        # Extract meanings
+        for meaning in data.get("meanings", []):
+            part = meaning.get("partOfSpeech", "")
+            output.append(f"\n➡️ {part.capitalize()}:")
+            
+            for idx, definition in enumerate(meaning.get("definitions", []), 1):
+                def_text = definition.get("definition", "")
+                example = definition.get("example", "")
+                syns = ", ".join(definition.get("synonyms", []))
+                ants = ", ".join(definition.get("antonyms", []))
+                
+                output.append(f"   {idx}. {def_text}")
+                if example:
+                    output.append(f"      Example: {example}")
+                if syns:
+                    output.append(f"      Synonyms: {syns}")
+                if ants:
+                    output.append(f"      Antonyms: {ants}")
+
+        return "\n".join(output)
+
+    def _get_related(self, word: str, kind: str) -> List[str]:
+        """Synonyms ('syn') or antonyms ('ant') from the local store, falling back to Datamuse"""
+        words = self.lexicon.get_related(word, kind)
+        if words is not None:
+            return words
+        
+        response = requests.get(self.datamuse_api, params={f"rel_{kind}": word}, timeout=5)
+        if response.status_code != 200:
+            return []
+        words = [w["word"] for w in response.json()]
+        self.lexicon.put_related(word, kind, words)
+        return words
+
     def synonyms(self, word: str) -> str:
-        """Fetch synonyms from Datamuse"""
+        """Fetch synonyms (local store first, then Datamuse)"""
         if not word:
             return "❌ Please provide a word to find synonyms for."
             
         try:
-            response = requests.get(self.datamuse_api, params={"rel_syn": word}, timeout=5)
-            if response.status_code == 200:
-                words = [w["word"] for w in response.json()]
-                if words:
-                    return f"🔗 Synonyms of '{word}': " + ", ".join(words[:15])
+            words = self._get_related(word, "syn")
+            if words:
+                return f"🔗 Synonyms of '{word}': " + ", ".join(words[:15])
             return f"❌ No synonyms found for '{word}'."
         except requests.RequestException:
             return "❌ Network error. Please check your connection and try again."
@@ -95,16 +204,14 @@ class DictionaryTool:
             return f"⚠️ Error: {str(e)}"
 
     def antonyms(self, word: str) -> str:
-        """Fetch antonyms from Datamuse"""
+        """Fetch antonyms (local store first, then Datamuse)"""
         if not word:
             return "❌ Please provide a word to find antonyms for."
             
         try:
-            response = requests.get(self.datamuse_api, params={"rel_ant": word}, timeout=5)
-            if response.status_code == 200:
-                words = [w["word"] for w in response.json()]
-                if words:
-                    return f"🔗 Antonyms of '{word}': " + ", ".join(words[:15])
+            words = self._get_related(word, "ant")
+            if words:
+                return f"🔗 Antonyms of '{word}': " + ", ".join(words[:15])
             return f"❌ No antonyms found for '{word}'."
         except requests.RequestException:
             return "❌ Network error. Please check your connection and try again."
@@ -112,6 +219,80 @@ class DictionaryTool:
             logger.error(f"Error fetching antonyms: {e}")
             return f"⚠️ Error: {str(e)}"
 
+    def lookup_all(self, word: str) -> str:
+        """Definition, synonyms and antonyms in one card, fetched concurrently"""
+        if not word:
+            return "❌ Please provide a word to look up."
+        
+        key = normalize_word(word)
+        with self._card_lock:
+            if key in self._card_cache:
+                self._card_cache.move_to_end(key)
+                return self._card_cache[key]
+        
+        # Fire all three lookups at once; latency is the slowest, not the sum
+        futures = {
+            "entry": self._executor.submit(self._get_entry, word),
+            "syn": self._executor.submit(self._get_related, word, "syn"),
+            "ant": self._executor.submit(self._get_related, word, "ant"),
+        }
+        results, failed = {}, []
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except requests.RequestException:
+                failed.append(name)
+                results[name] = None if name == "entry" else []
+            except Exception as e:
+                logger.error(f"Error in word lookup ({name}): {e}")
+                failed.append(name)
+                results[name] = None if name == "entry" else []
+        
+        entry = results["entry"]
+        if len(failed) == len(futures):
+            return "❌ Network error. Please check your connection and try again."
+        
+        # dictionaryapi.dev already carries synonyms/antonyms; merge them with Datamuse's
+        synonyms, antonyms = [], []
+        if entry:
+            for meaning in entry.get("meanings", []):
+                synonyms.extend(meaning.get("synonyms", []))
+                antonyms.extend(meaning.get("antonyms", []))
+                for definition in meaning.get("definitions", []):
+                    synonyms.extend(definition.get("synonyms", []))
+                    antonyms.extend(definition.get("antonyms", []))
+        synonyms = _dedupe(synonyms + results["syn"], exclude=key)
+        antonyms = _dedupe(antonyms + results["ant"], exclude=key)
+        
+        if not entry and not synonyms and not antonyms:
+            return f"❌ Nothing found for '{word}'."
+        
+        output = [f"📖 Word: {entry.get('word', word) if entry else word}"]
+        if entry:
+            phonetics = [p.get("text") for p in entry.get("phonetics", []) if p.get("text")]
+            if phonetics:
+                output.append(f"🔊 Pronunciation: {', '.join(phonetics)}")
+            for meaning in entry.get("meanings", []):
+                definitions = meaning.get("definitions", [])
+                if definitions:
+                    part = meaning.get("partOfSpeech", "").capitalize()
+                    output.append(f"➡️ {part}: {definitions[0].get('definition', '')}")
+        else:
+            output.append("➡️ No definition found.")
+        if synonyms:
+            output.append("🔗 Synonyms: " + ", ".join(synonyms[:15]))
+        if antonyms:
+            output.append("🔗 Antonyms: " + ", ".join(antonyms[:15]))
+        card = "\n".join(output)
+        
+        # Only cache complete cards so a transient failure isn't remembered
+        if not failed:
+            with self._card_lock:
+                self._card_cache[key] = card
+                if len(self._card_cache) > self._card_cache_size:
+                    self._card_cache.popitem(last=False)
+        return card
+
     def translate(self, text: str, source: str = "auto", target: str = "en") -> str:
         """Translate text using LibreTranslate"""
         if not text:
@@ -126,23 +307,50 @@ class DictionaryTool:
             if source != "auto" and source not in self.supported_languages:
                 return f"❌ Unsupported source language: {source}. Use 'list languages' to see supported languages."
 
-            payload = {
-                "q": text,
-                "source": source,
-                "target": target,
-                "format": "text"
-            }
+            # Split into sentences and serve what we can from translation memory
+            segments = split_sentences(text) or [text]
+            known = self.translation_memory.get_many(source, target, segments)
+            missing, missing_keys = [], set()
+            for seg in segments:
+                key = self.translation_memory.key(seg)
+                if key not in known and key not in missing_keys:
+                    missing.append(seg)
+                    missing_keys.add(key)
             
-            response = requests.post(self.translate_api, data=payload, timeout=10)
-            if response.status_code == 200:
-                translated_text = response.json().get('translatedText', '')
-                source_lang = source if source != "auto" else "auto-detected"
-                return f"🌐 Translation ({source_lang} → {target}): {translated_text}"
+            if missing:
+                translated = self._translate_batch(missing, source, target)
+                if translated is None:
+                    return "❌ Translation failed. Please try again later."
+                pairs = list(zip(missing, translated))
+                self.translation_memory.put_many(source, target, pairs)
+                for seg, tr in pairs:
+                    known[self.translation_memory.key(seg)] = tr
             
-            return "❌ Translation failed. Please try again later."
+            translated_text = " ".join(known[self.translation_memory.key(seg)] for seg in segments)
+            source_lang = source if source != "auto" else "auto-detected"
+            return f"🌐 Translation ({source_lang} → {target}): {translated_text}"
             
         except requests.RequestException:
             return "❌ Network error. Please check your connection and try again."
         except Exception as e:
             logger.error(f"Error during translation: {e}")
-            return f"⚠️ Error: {str(e)}"
\ No newline at end of file
+            return f"⚠️ Error: {str(e)}"
+
+    def _translate_batch(self, segments: List[str], source: str, target: str) -> Optional[List[str]]:
+        """Translate several segments in one LibreTranslate request"""
+        payload = {
+            "q": segments if len(segments) > 1 else segments[0],
+            "source": source,
+            "target": target,
+            "format": "text"
+        }
+        response = requests.post(self.translate_api, json=payload, timeout=10)
+        if response.status_code != 200:
+            return None
+        translated = response.json().get('translatedText', '')
+        if isinstance(translated, str):
+            translated = [translated]
+        if len(translated) != len(segments):
+            logger.error(f"Translation batch size mismatch: sent {len(segments)}, got {len(translated)}")
+            return None
+        return translated
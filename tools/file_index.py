@@ -0,0 +1,259 @@
+"""Incremental inverted index of the files Mini may read.
+
+A background thread walks the sandboxed workspace (the directory that
+sanitize_path allows), tokenises text files and stores token -> (file,
+line numbers) in SQLite. Each pass only re-reads files whose mtime or
+size changed and drops files that disappeared, so `findall` answers from
+the index instead of opening every file.
+"""
+import os
+import re
+import heapq
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger('FileIndex')
+
+DEFAULT_DB_PATH = os.path.join("data", "file_index.sqlite")
+REFRESH_INTERVAL = int(os.getenv("MINI_FILE_INDEX_INTERVAL", "300"))  # seconds between passes
+MAX_FILE_BYTES = int(float(os.getenv("MINI_FILE_INDEX_MAX_MB", "5")) * 1024 * 1024)
+MAX_RESULTS = 30
+COMMIT_EVERY = 500  # files per transaction; postings land all over the B-tree, so batch them
+MAX_LINE_CHARS = 200
+MAX_IN_IDS = 500  # candidate files passed to SQLite as IN (...); more than that scans the token's postings
+SKIP_DIRS = frozenset({".git", ".hg", ".svn", "__pycache__", "node_modules", "venv", ".venv",
+                       ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache"})
+BINARY_EXTENSIONS = frozenset({".sqlite", ".db", ".f16", ".z", ".zst", ".gz", ".zip", ".pyc", ".so",
+                               ".dll", ".exe", ".png", ".jpg", ".jpeg", ".gif", ".ico", ".mp3",
+                               ".wav", ".pdf", ".rlib", ".whl"})
+TOKEN = re.compile(r'\w{2,64}')
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+
+def _is_text(path: str) -> bool:
+    with open(path, "rb") as f:
+        return b"\0" not in f.read(8192)
+
+
+class FileIndex:
+    def __init__(self, root: Optional[str] = None, db_path: str = DEFAULT_DB_PATH):
+        self.root = os.path.abspath(root or os.getcwd())
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                token TEXT NOT NULL,
+                file_id INTEGER NOT NULL,
+                lines TEXT NOT NULL,
+                PRIMARY KEY (token, file_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_file ON postings(file_id);
+        ''')
+        self.conn.commit()
+        self.ready = self.file_count() > 0  # a previous run's index is usable straight away
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------------- WALK ----------------
+    def _walk(self):
+        """(relative path, mtime, size) of every indexable file under root"""
+        db_file = os.path.abspath(self.db_path)
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    if os.path.splitext(entry.name)[1].lower() in BINARY_EXTENSIONS:
+                        continue
+                    if entry.path.startswith(db_file):  # the index itself and its WAL files
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if stat.st_size <= MAX_FILE_BYTES:
+                    yield os.path.relpath(entry.path, self.root), stat.st_mtime, stat.st_size
+
+    # ---------------- INDEXING ----------------
+    def _postings(self, path: str) -> Dict[str, List[int]]:
+        postings: Dict[str, List[int]] = {}
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for number, line in enumerate(f, 1):
+                for token in set(tokenize(line)):
+                    postings.setdefault(token, []).append(number)
+        return postings
+
+    def _index_file(self, rel_path: str, mtime: float, size: int, file_id: Optional[int]):
+        """Replace one file's postings (left uncommitted; refresh commits in batches)"""
+        full_path = os.path.join(self.root, rel_path)
+        try:
+            postings = self._postings(full_path) if _is_text(full_path) else {}
+        except OSError as e:
+            logger.debug(f"Skipping {rel_path}: {e}")
+            return
+        with self._lock:
+            if file_id is None:
+                file_id = self.conn.execute(
+                    "INSERT INTO files (path, mtime, size) VALUES (?, ?, ?)", (rel_path, mtime, size)
+                ).lastrowid
+            else:
+                self.conn.execute("UPDATE files SET mtime = ?, size = ? WHERE id = ?", (mtime, size, file_id))
+                self.conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+            self.conn.executemany(
+                "INSERT INTO postings (token, file_id, lines) VALUES (?, ?, ?)",
+                ((token, file_id, ",".join(map(str, lines))) for token, lines in postings.items())
+            )
+
+    def refresh(self) -> Dict[str, int]:
+        """One incremental pass: index new and changed files, forget removed ones"""
+        with self._lock:
+            known = {path: (file_id, mtime, size) for file_id, path, mtime, size
+                     in self.conn.execute("SELECT id, path, mtime, size FROM files")}
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        for rel_path, mtime, size in self._walk():
+            if self._stop.is_set():
+                break
+            previous = known.pop(rel_path, None)
+            if previous and previous[1] == mtime and previous[2] == size:
+                counts["unchanged"] += 1
+                continue
+            self._index_file(rel_path, mtime, size, previous[0] if previous else None)
+            counts["indexed"] += 1
+            if counts["indexed"] % COMMIT_EVERY == 0:
+                self._commit()
+        else:
+            if known:
+                removed = [(file_id,) for file_id, _, _ in known.values()]
+                with self._lock, self.conn:
+                    self.conn.executemany("DELETE FROM postings WHERE file_id = ?", removed)
+                    self.conn.executemany("DELETE FROM files WHERE id = ?", removed)
+                counts["removed"] = len(removed)
+            self.ready = True
+        self._commit()
+        return counts
+
+    def _commit(self):
+        with self._lock:
+            self.conn.commit()
+
+    # ---------------- SEARCH ----------------
+    def search(self, query: str, limit: int = MAX_RESULTS) -> List[Tuple[str, int]]:
+        """(path, line) pairs where every word of query appears on the same line"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        hits: Optional[Dict[int, Set[int]]] = None
+        with self._lock:
+            # Rarest token first, so each later lookup only touches the files still in the running
+            counts = dict(self.conn.execute(
+                f"SELECT token, COUNT(*) FROM postings WHERE token IN ({','.join('?' * len(tokens))}) "
+                "GROUP BY token", tokens
+            ).fetchall())
+            if len(counts) < len(tokens):
+                return []
+            for token in sorted(tokens, key=counts.__getitem__):
+                if hits is not None and len(hits) <= MAX_IN_IDS:
+                    rows = self.conn.execute(
+                        f"SELECT file_id, lines FROM postings WHERE token = ? "
+                        f"AND file_id IN ({','.join('?' * len(hits))})", (token, *hits)
+                    ).fetchall()
+                else:
+                    rows = self.conn.execute(
+                        "SELECT file_id, lines FROM postings WHERE token = ?", (token,)
+                    ).fetchall()
+                found = {file_id: set(map(int, lines.split(","))) for file_id, lines in rows
+                         if hits is None or file_id in hits}
+                if hits is not None:
+                    found = {file_id: lines & hits[file_id] for file_id, lines in found.items()}
+                hits = {file_id: lines for file_id, lines in found.items() if lines}
+                if not hits:
+                    return []
+            paths = dict(self.conn.execute(
+                f"SELECT id, path FROM files WHERE id IN ({','.join('?' * len(hits))})", tuple(hits)
+            ).fetchall())
+        return heapq.nsmallest(limit, ((paths[file_id], line) for file_id, lines in hits.items() for line in lines))
+
+    def snippets(self, results: List[Tuple[str, int]]) -> List[Tuple[str, int, str]]:
+        """Attach the current text of each hit, reading every file once"""
+        wanted: Dict[str, Set[int]] = {}
+        for path, line in results:
+            wanted.setdefault(path, set()).add(line)
+        text: Dict[Tuple[str, int], str] = {}
+        for path, lines in wanted.items():
+            last = max(lines)
+            try:
+                with open(os.path.join(self.root, path), "r", encoding="utf-8", errors="replace") as f:
+                    for number, line in enumerate(f, 1):
+                        if number in lines:
+                            text[(path, number)] = line.strip()[:MAX_LINE_CHARS]
+                        if number >= last:
+                            break
+            except OSError:
+                pass
+        return [(path, line, text.get((path, line), "")) for path, line in results]
+
+    def file_count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    # ---------------- BACKGROUND ----------------
+    def _loop(self, interval: int):
+        while not self._stop.is_set():
+            started = time.time()
+            try:
+                counts = self.refresh()
+                if counts["indexed"] or counts["removed"]:
+                    logger.info(f"File index pass in {time.time() - started:.1f}s: {counts}")
+            except Exception as e:
+                logger.error(f"File index pass failed: {e}")
+            self._stop.wait(interval)
+
+    def start(self, interval: int = REFRESH_INTERVAL):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,), name="file-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_index() -> FileIndex:
+    """Shared index of the current working directory (not started)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FileIndex()
+        return _index
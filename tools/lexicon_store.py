@@ -0,0 +1,192 @@
+"""Local lexical database backing DictionaryTool.
+
+Definitions are stored in the dictionaryapi.dev entry format so the same
+formatter renders both online and offline results. Synonym/antonym lists
+are stored per (word, kind). Bulk import:
+
+    python -m tools.lexicon_store import words.jsonl
+    python -m tools.lexicon_store import-wordnet      # needs nltk + wordnet corpus
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger('LexiconStore')
+
+DEFAULT_DB_PATH = os.path.join("data", "lexicon.sqlite")
+RELATION_KINDS = ("syn", "ant")
+
+
+def normalize_word(word: str) -> str:
+    return word.strip().lower()
+
+
+class LexiconStore:
+    """SQLite store of definitions and synonym/antonym lists"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                word TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                fetched REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS relations (
+                word TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                words TEXT NOT NULL,
+                fetched REAL NOT NULL,
+                PRIMARY KEY (word, kind)
+            ) WITHOUT ROWID;
+        ''')
+        self.conn.commit()
+
+    # ---------------- LOOKUPS ----------------
+    def get_entry(self, word: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM entries WHERE word = ?", (normalize_word(word),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_related(self, word: str, kind: str) -> Optional[List[str]]:
+        """Return the stored list (possibly empty), or None if never looked up"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT words FROM relations WHERE word = ? AND kind = ?",
+                (normalize_word(word), kind)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # ---------------- WRITE-BACK ----------------
+    def put_entry(self, word: str, data: Dict):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                (normalize_word(word), json.dumps(data, ensure_ascii=False), time.time())
+            )
+
+    def put_related(self, word: str, kind: str, words: List[str]):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO relations VALUES (?, ?, ?, ?)",
+                (normalize_word(word), kind, json.dumps(words, ensure_ascii=False), time.time())
+            )
+
+    # ---------------- BULK IMPORT ----------------
+    def bulk_import(self, records: Iterable[Dict], batch_size: int = 5000) -> int:
+        """Import records of the form {word, meanings?, synonyms?, antonyms?}.
+
+        `meanings` follows the dictionaryapi.dev entry layout. Returns the
+        number of words imported.
+        """
+        count = 0
+        entries, relations = [], []
+        now = time.time()
+
+        def flush():
+            with self._lock, self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", entries)
+                self.conn.executemany("INSERT OR REPLACE INTO relations VALUES (?, ?, ?, ?)", relations)
+            entries.clear()
+            relations.clear()
+
+        for rec in records:
+            word = normalize_word(rec.get("word", ""))
+            if not word:
+                continue
+            if rec.get("meanings"):
+                entry = {k: v for k, v in rec.items() if k not in ("synonyms", "antonyms")}
+                entries.append((word, json.dumps(entry, ensure_ascii=False), now))
+            for kind, key in (("syn", "synonyms"), ("ant", "antonyms")):
+                if key in rec:
+                    relations.append((word, kind, json.dumps(rec[key], ensure_ascii=False), now))
+            count += 1
+            if len(entries) + len(relations) >= batch_size:
+                flush()
+        flush()
+        return count
+
+    def import_jsonl(self, path: str) -> int:
+        def records():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+        return self.bulk_import(records())
+
+    def import_wordnet(self) -> int:
+        """Import every WordNet lemma via nltk (optional dependency)"""
+        try:
+            from nltk.corpus import wordnet as wn
+        except ImportError:
+            raise RuntimeError("nltk is not installed. Run: pip install nltk && python -m nltk.downloader wordnet")
+        return self.bulk_import(_wordnet_records(wn))
+
+
+def _wordnet_records(wn):
+    pos_names = {"n": "noun", "v": "verb", "a": "adjective", "s": "adjective", "r": "adverb"}
+    for lemma_name in wn.all_lemma_names():
+        word = lemma_name.replace("_", " ")
+        meanings: Dict[str, List[Dict]] = {}
+        synonyms, antonyms = [], []
+        for synset in wn.synsets(lemma_name):
+            syns = [l.name().replace("_", " ") for l in synset.lemmas() if l.name() != lemma_name]
+            ants = [a.name().replace("_", " ")
+                    for l in synset.lemmas() if l.name() == lemma_name
+                    for a in l.antonyms()]
+            examples = synset.examples()
+            meanings.setdefault(pos_names.get(synset.pos(), synset.pos()), []).append({
+                "definition": synset.definition(),
+                "example": examples[0] if examples else "",
+                "synonyms": syns,
+                "antonyms": ants,
+            })
+            synonyms.extend(s for s in syns if s not in synonyms)
+            antonyms.extend(a for a in ants if a not in antonyms)
+        yield {
+            "word": word,
+            "phonetics": [],
+            "meanings": [{"partOfSpeech": pos, "definitions": defs} for pos, defs in meanings.items()],
+            "synonyms": synonyms,
+            "antonyms": antonyms,
+        }
+
+
+def main(argv: List[str]) -> int:
+    usage = "Usage: python -m tools.lexicon_store [--db PATH] (import FILE.jsonl | import-wordnet)"
+    db_path = DEFAULT_DB_PATH
+    if len(argv) >= 2 and argv[0] == "--db":
+        db_path, argv = argv[1], argv[2:]
+    if not argv:
+        print(usage)
+        return 1
+
+    store = LexiconStore(db_path)
+    started = time.time()
+    if argv[0] == "import" and len(argv) == 2:
+        count = store.import_jsonl(argv[1])
+    elif argv[0] == "import-wordnet":
+        count = store.import_wordnet()
+    else:
+        print(usage)
+        return 1
+    print(f"Imported {count} words into {db_path} in {time.time() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
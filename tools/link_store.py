@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger('LinkStore')
+
+# Optional zstandard: smaller and faster than zlib when available
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+CHUNK_SIZE = 64 * 1024
+MAX_WORKERS = int(os.getenv("MINI_LINK_WORKERS", "8"))
+
+
+class LinkStore:
+    """Content-addressed, compressed copies of downloaded URLs in one folder.
+
+    Bodies are streamed in chunks through a hasher and a compressor into
+    objects/<sha256>.<z|zst>, so memory use does not depend on page size.
+    manifest.json maps each URL to its hash, size, fetch time and
+    validators; re-fetches send If-None-Match / If-Modified-Since and a
+    body whose hash is unchanged is not written again.
+    """
+
+    def __init__(self, folder: str, max_workers: int = MAX_WORKERS):
+        self.folder = folder
+        self.objects_dir = os.path.join(folder, "objects")
+        self.manifest_path = os.path.join(folder, "manifest.json")
+        self.max_workers = max_workers
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    # ---------------- MANIFEST ----------------
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Error loading manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _save_manifest(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    # ---------------- OBJECTS ----------------
+    @staticmethod
+    def _compressor():
+        if HAS_ZSTD:
+            return "zst", zstandard.ZstdCompressor(level=3).compressobj()
+        return "z", zlib.compressobj(6)
+
+    def object_path(self, record: dict) -> str:
+        return os.path.join(self.objects_dir, record["file"])
+
+    def read(self, url: str) -> Optional[bytes]:
+        """Decompressed body stored for url, or None"""
+        record = self.manifest.get(url)
+        if not record:
+            return None
+        with open(self.object_path(record), "rb") as f:
+            data = f.read()
+        if record["file"].endswith(".zst"):
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        return zlib.decompress(data)
+
+    # ---------------- FETCH ----------------
+    def _fetch(self, url: str, timeout: float) -> str:
+        """Download one URL. Returns 'stored', 'unchanged' or 'failed'."""
+        previous = self.manifest.get(url)
+        headers = {}
+        if previous:
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+
+        try:
+            with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+                if response.status_code == 304 and previous:
+                    self._record(url, dict(previous, fetched_at=time.time()))
+                    return "unchanged"
+                if response.status_code != 200:
+                    logger.warning(f"Failed to fetch URL {url}: Status {response.status_code}")
+                    return "failed"
+
+                ext, compressor = self._compressor()
+                hasher = hashlib.sha256()
+                size = 0
+                tmp_path = os.path.join(self.objects_dir, f".{threading.get_ident()}.tmp")
+                try:
+                    with open(tmp_path, "wb") as f:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            hasher.update(chunk)
+                            size += len(chunk)
+                            f.write(compressor.compress(chunk))
+                        f.write(compressor.flush())
+                    content_hash = hasher.hexdigest()
+                    filename = f"{content_hash}.{ext}"
+                    if previous and previous["hash"] == content_hash:
+                        status = "unchanged"
+                        filename = previous["file"]
+                    elif os.path.exists(os.path.join(self.objects_dir, filename)):
+                        status = "stored"  # identical body already stored for another URL
+                    else:
+                        os.replace(tmp_path, os.path.join(self.objects_dir, filename))
+                        status = "stored"
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+
+                self._record(url, {
+                    "hash": content_hash,
+                    "file": filename,
+                    "size": size,
+                    "fetched_at": time.time(),
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                })
+                return status
+        except Exception as e:
+            logger.error(f"Error fetching URL {url}: {e}")
+            return "failed"
+
+    def _record(self, url: str, record: dict):
+        with self._lock:
+            self.manifest[url] = record
+
+    def store(self, links: List[str], timeout: float = 10) -> Dict[str, List[str]]:
+        """Fetch links concurrently; returns URLs grouped by outcome"""
+        results = {"stored": [], "unchanged": [], "failed": []}
+        links = list(dict.fromkeys(links))
+        if not links:
+            return results
+        workers = max(1, min(self.max_workers, len(links)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="links") as executor:
+            for url, status in zip(links, executor.map(lambda u: self._fetch(u, timeout), links)):
+                results[status].append(url)
+        with self._lock:
+            self._save_manifest()
+        return results
@@ -0,0 +1,174 @@
+"""SQLite store for Mini's notes with full-text search.
+
+Notes get an id and a timestamp; an FTS5 index (kept in sync by triggers)
+serves `searchnotes`. Pages are read newest-first straight off the
+primary key, continuing below the last id shown (keyset paging), so
+reading page N costs the same as reading page 1. The old flat
+tools/notes.txt is imported automatically on first use, or by hand:
+
+    python -m tools.notes_store import path/to/notes.txt
+"""
+import os
+import re
+import sys
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger('NotesStore')
+
+DEFAULT_DB_PATH = os.path.join("data", "notes.sqlite")
+LEGACY_NOTES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "notes.txt")
+PAGE_SIZE = 10
+
+
+class Note:
+    __slots__ = ("id", "text", "created")
+
+    def __init__(self, id: int, text: str, created: float):
+        self.id = id
+        self.text = text
+        self.created = created
+
+    def describe(self) -> str:
+        stamp = datetime.fromtimestamp(self.created).strftime("%d %b %Y %H:%M")
+        return f"#{self.id} [{stamp}] {self.text}"
+
+
+def _match_expression(query: str) -> str:
+    """All words must appear; the last may be a prefix (search as you type)"""
+    words = re.findall(r'\w+', query.lower())
+    terms = [f'"{w}"' for w in words]
+    if terms:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class NotesStore:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS notes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text TEXT NOT NULL,
+                created REAL NOT NULL
+            )
+        ''')
+        try:
+            self.conn.executescript('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+                    text, content='notes', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+                    INSERT INTO notes_fts(rowid, text) VALUES (new.id, new.text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+                    INSERT INTO notes_fts(notes_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                END;
+            ''')
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, note search falls back to LIKE: {e}")
+            self.has_fts = False
+        self.conn.commit()
+
+    # ---------------- WRITE ----------------
+    def add(self, text: str, created: Optional[float] = None) -> int:
+        with self._lock, self.conn:
+            cur = self.conn.execute("INSERT INTO notes (text, created) VALUES (?, ?)",
+                                    (text, created or time.time()))
+        return cur.lastrowid
+
+    def delete(self, note_id: int) -> bool:
+        with self._lock, self.conn:
+            cur = self.conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        return cur.rowcount > 0
+
+    def clear(self) -> int:
+        with self._lock, self.conn:
+            cur = self.conn.execute("DELETE FROM notes")
+        return cur.rowcount
+
+    def import_text_file(self, path: str) -> int:
+        """One note per non-empty line, stamped with the file's mtime"""
+        created = os.path.getmtime(path)
+        with open(path, "r", encoding="utf-8") as f:
+            rows = [(line.strip(), created) for line in f if line.strip()]
+        with self._lock, self.conn:
+            self.conn.executemany("INSERT INTO notes (text, created) VALUES (?, ?)", rows)
+        return len(rows)
+
+    # ---------------- READ ----------------
+    def page(self, before_id: Optional[int] = None, per_page: int = PAGE_SIZE) -> Tuple[List[Note], bool]:
+        """Newest-first notes older than before_id (all when None), and whether more follow"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, text, created FROM notes WHERE id < ? ORDER BY id DESC LIMIT ?",
+                (before_id if before_id is not None else sys.maxsize, per_page + 1)
+            ).fetchall()
+        return [Note(*row) for row in rows[:per_page]], len(rows) > per_page
+
+    def search(self, query: str, limit: int = PAGE_SIZE) -> List[Note]:
+        """Best-matching notes for query"""
+        with self._lock:
+            if self.has_fts:
+                expression = _match_expression(query)
+                if not expression:
+                    return []
+                rows = self.conn.execute('''
+                    SELECT n.id, n.text, n.created FROM notes_fts
+                    JOIN notes n ON n.id = notes_fts.rowid
+                    WHERE notes_fts MATCH ? ORDER BY bm25(notes_fts) LIMIT ?
+                ''', (expression, limit)).fetchall()
+            else:
+                rows = self.conn.execute(
+                    "SELECT id, text, created FROM notes WHERE text LIKE ? ORDER BY id DESC LIMIT ?",
+                    (f"%{query.strip()}%", limit)
+                ).fetchall()
+        return [Note(*row) for row in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store() -> NotesStore:
+    """Shared store; migrates the legacy notes.txt the first time"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = NotesStore()
+            if os.path.exists(LEGACY_NOTES_FILE):
+                try:
+                    count = _store.import_text_file(LEGACY_NOTES_FILE)
+                    os.replace(LEGACY_NOTES_FILE, LEGACY_NOTES_FILE + ".imported")
+                    logger.info(f"Imported {count} notes from {LEGACY_NOTES_FILE}")
+                except Exception as e:
+                    logger.error(f"Could not import {LEGACY_NOTES_FILE}: {e}")
+        return _store
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    db_path = DEFAULT_DB_PATH
+    if len(args) >= 2 and args[0] == "--db":
+        db_path = args[1]
+        args = args[2:]
+    if len(args) == 2 and args[0] == "import":
+        count = NotesStore(db_path).import_text_file(args[1])
+        print(f"Imported {count} notes into {db_path}")
+        return 0
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
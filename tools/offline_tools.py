@@ -4,12 +4,19 @@ import os
 import platform
 import random
 import time
-import threading
 import requests
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict
+from functools import lru_cache
 import ast
 import re
+from tools.prefetch import PrefetchBuffer
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 # ---------------- SECURITY HELPER ----------------
 def sanitize_path(user_path: str) -> str:
@@ -23,31 +30,66 @@ def sanitize_path(user_path: str) -> str:
     return resolved_path
 
 # ---------------- SAFE MATH EVALUATION (FIXED) ----------------
-def safe_eval(expr: str) -> float:
-    """Evaluate math expressions safely with trigonometric support"""
+EXPR_CACHE_SIZE = 512  # validated, compiled expressions kept by text
+MAX_POINTS = 1_000_000  # values one vectorized math/table query may compute
+TABLE_ROWS = 20  # rows shown by table before the middle is elided
+
+# Whitelist of allowed functions and constants, in scalar and array form
+MATH_NAMES = {'pi': math.pi, 'e': math.e, 'sin': math.sin, 'cos': math.cos,
+              'tan': math.tan, 'sqrt': math.sqrt}
+ARRAY_NAMES = ({'pi': np.pi, 'e': np.e, 'sin': np.sin, 'cos': np.cos,
+                'tan': np.tan, 'sqrt': np.sqrt} if HAS_NUMPY else {})
+
+@lru_cache(maxsize=EXPR_CACHE_SIZE)
+def _compile_expr(expr: str, variable: Optional[str] = None):
+    """Parse, check against the whitelist and compile once per (expression, variable)"""
     tree = ast.parse(expr, mode='eval')
-    
-    # Whitelist of allowed functions and constants
-    allowed_names = {
-        'pi': math.pi, 
-        'e': math.e,
-        'sin': math.sin,
-        'cos': math.cos,
-        'tan': math.tan,
-        'sqrt': math.sqrt
-    }
+    allowed = set(MATH_NAMES) | ({variable} if variable else set())
     
     for node in ast.walk(tree):
         if isinstance(node, ast.Call):
             # Only allow calls to whitelisted functions
-            if not isinstance(node.func, ast.Name) or node.func.id not in allowed_names:
+            if not isinstance(node.func, ast.Name) or node.func.id not in MATH_NAMES:
                 raise ValueError("Function calls not allowed")
         if isinstance(node, (ast.Attribute, ast.Subscript)):
             raise ValueError("Attribute access not allowed")
-        if isinstance(node, ast.Name) and node.id not in allowed_names:
-            raise ValueError(f"Invalid identifier: {node.id}")
+        if isinstance(node, ast.Name):
+            if node.id not in allowed:
+                raise ValueError(f"Invalid identifier: {node.id}")
+            if not isinstance(node.ctx, ast.Load):
+                raise ValueError("Assignment not allowed")
     
-    return eval(compile(tree, '<string>', 'eval'), {'__builtins__': None}, allowed_names)
+    return compile(tree, '<string>', 'eval')
+
+def safe_eval(expr: str) -> float:
+    """Evaluate math expressions safely with trigonometric support"""
+    return eval(_compile_expr(expr), {'__builtins__': None}, dict(MATH_NAMES))
+
+def eval_range(expr: str, variable: str, start: float, stop: float, step: float = 1.0):
+    """Evaluate expr for variable = start, start+step, ... stop; returns (xs, ys).
+
+    With NumPy the whole range is computed in one pass over arrays;
+    without it each point is evaluated in turn (failures become nan).
+    """
+    if step == 0 or (stop - start) / step < 0:
+        raise ValueError("Step must move from start towards end")
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    if count > MAX_POINTS:
+        raise ValueError(f"Too many points ({count}); the limit is {MAX_POINTS}")
+    code = _compile_expr(expr, variable)
+    if HAS_NUMPY:
+        xs = start + step * np.arange(count)
+        with np.errstate(all='ignore'):
+            ys = eval(code, {'__builtins__': None}, dict(ARRAY_NAMES, **{variable: xs}))
+        return xs, np.broadcast_to(np.asarray(ys, dtype=float), xs.shape)
+    xs = [start + step * i for i in range(count)]
+    ys = []
+    for x in xs:
+        try:
+            ys.append(float(eval(code, {'__builtins__': None}, dict(MATH_NAMES, **{variable: x}))))
+        except (ValueError, ZeroDivisionError, OverflowError):
+            ys.append(float('nan'))
+    return xs, ys
 
 # ---------------- DATE & TIME ----------------
 def current_time() -> str:
@@ -60,21 +102,152 @@ def day_of_week() -> str:
     return datetime.now().strftime("%A")
 
 # ---------------- MATH ----------------
+_NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?'
+RANGE_QUERY = re.compile(
+    rf'^(?P<expr>.+?)\s+for\s+(?P<var>[a-z_]\w*)\s+in\s+(?P<start>{_NUMBER})\s*\.\.\s*'
+    rf'(?P<stop>{_NUMBER})(?:\s+step\s+(?P<step>{_NUMBER}))?$',
+    re.IGNORECASE
+)
+
+def _parse_range(query: str):
+    """(expr, variable, start, stop, step) for '<expr> for x in a..b [step s]', else None"""
+    match = RANGE_QUERY.match(query.strip())
+    if not match:
+        return None
+    step = float(match.group('step')) if match.group('step') else 1.0
+    return (match.group('expr'), match.group('var'),
+            float(match.group('start')), float(match.group('stop')), step)
+
+def _range_summary(ys) -> str:
+    """Count, min and max of the defined values, plus how many points were undefined (nan)"""
+    if HAS_NUMPY:
+        defined = ys[~np.isnan(ys)]
+        low, high = (defined.min(), defined.max()) if defined.size else (None, None)
+        count = int(defined.size)
+    else:
+        defined = [y for y in ys if y == y]  # nan != nan
+        low, high = (min(defined), max(defined)) if defined else (None, None)
+        count = len(defined)
+    summary = f"{len(ys)} values"
+    if low is not None:
+        summary += f", min {low:.6g}, max {high:.6g}"
+    if count < len(ys):
+        summary += f", {len(ys) - count} undefined"
+    return summary
+
 def simple_math(expr: str) -> Optional[str]:
     try:
+        query = _parse_range(expr)
+        if query:
+            xs, ys = eval_range(*query)
+            values = ", ".join(f"{y:.6g}" for y in ys[:10])
+            if len(ys) > 10:
+                values += f", ... ({_range_summary(ys)})"
+            return f"Result: [{values}]"
         result = safe_eval(expr)
         return f"Result: {result}"
     except Exception as e:
         return f"Could not calculate: {e}"
 
+def math_table(query: str) -> str:
+    """Two-column table of an expression over a range; a bare number gives its times table"""
+    try:
+        query = query.strip()
+        if re.fullmatch(_NUMBER, query):
+            query = f"{query}*n for n in 1..10"
+        parsed = _parse_range(query)
+        if not parsed:
+            return "Usage: table <expression> for x in <start>..<end> [step s]"
+        expr, variable = parsed[0], parsed[1]
+        xs, ys = eval_range(*parsed)
+        rows = [f"{x:>10.6g} | {y:.6g}" for x, y in zip(xs[:TABLE_ROWS], ys[:TABLE_ROWS])]
+        if len(xs) > TABLE_ROWS:
+            half = TABLE_ROWS // 2
+            rows = rows[:half] + [f"{'...':>10} | ... ({len(xs) - TABLE_ROWS} more)"] + \
+                [f"{x:>10.6g} | {y:.6g}" for x, y in zip(xs[-half:], ys[-half:])]
+        return f"{variable:>10} | {expr}\n" + "\n".join(rows)
+    except Exception as e:
+        return f"Could not calculate: {e}"
+
 # ---------------- FILE OPERATIONS ----------------
-def read_file(file_path: str) -> str:
+CHUNK_SIZE = 1 << 20  # bytes (or characters) read at a time, so large files never load whole
+READ_LINES = 50  # default lines shown by read
+MAX_READ_LINES = 1000  # most lines one read shows, whatever N or range was asked for
+MAX_TAIL_BYTES = 4 * CHUNK_SIZE  # tail stops reading backwards after this much
+MAX_OUTPUT_LINE = 300  # longer lines are cut in read/search output
+MAX_MATCHES = 50
+# Line boundaries str.splitlines() recognises once text mode has turned \r and \r\n into \n
+_LINE_BREAKS = "\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+def _clip(line: str) -> str:
+    line = line.rstrip("\r\n")
+    return line if len(line) <= MAX_OUTPUT_LINE else line[:MAX_OUTPUT_LINE] + " …"
+
+def _iter_lines(f):
+    """(line number, text) pairs; lines longer than CHUNK_SIZE come in several pieces"""
+    number = 1
+    while True:
+        piece = f.readline(CHUNK_SIZE)
+        if not piece:
+            return
+        yield number, piece
+        if piece.endswith("\n"):
+            number += 1
+
+def _tail_lines(safe_path: str, count: int) -> List[str]:
+    """Last count lines, reading backwards in chunks from the end (at most MAX_TAIL_BYTES)"""
+    with open(safe_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= count and len(data) < MAX_TAIL_BYTES:
+            step = min(CHUNK_SIZE, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    if position > 0 and len(lines) > 1:
+        lines = lines[1:]  # out of budget mid-line: drop the partial first one
+    return lines[-count:]
+
+def read_file(file_path: str, spec: str = "") -> str:
+    """First lines of a file, or 'head N', 'tail N' or a 'start-end' line range"""
     try:
         safe_path = sanitize_path(file_path)
-        if os.path.exists(safe_path):
-            with open(safe_path, "r", encoding="utf-8") as f:
-                return f.read()
-        return "File not found."
+        if not os.path.exists(safe_path):
+            return "File not found."
+        spec = spec.strip().lower()
+        usage = "Usage: read <file> [head N | tail N | start-end]"
+        match = re.fullmatch(r'(head|tail)(?:\s+(\d+))?|(\d+)\s*-\s*(\d+)|', spec)
+        if match is None:
+            return usage
+        if match.group(3):
+            first, last = int(match.group(3)), int(match.group(4))
+        else:
+            first, last = 1, int(match.group(2) or READ_LINES)
+        if first < 1 or last < first:
+            return usage
+        clamped = last - first + 1 > MAX_READ_LINES
+        if clamped:
+            last = first + MAX_READ_LINES - 1
+        if match.group(1) == "tail":
+            lines = _tail_lines(safe_path, last)
+            text = "\n".join(_clip(line) for line in lines)
+            if clamped:
+                text = f"... (showing the last {MAX_READ_LINES} lines)\n" + text
+            return text
+        shown, more = [], False
+        with open(safe_path, "r", encoding="utf-8", errors="replace") as f:
+            for number, piece in _iter_lines(f):
+                if number > last:
+                    more = True
+                    break
+                if number >= first and (not shown or shown[-1][0] != number):
+                    shown.append((number, piece))
+        text = "\n".join(_clip(piece) for _, piece in shown)
+        if more and (clamped or not spec):
+            text += f"\n... (read {file_path} {last + 1}-{last + READ_LINES} for more)"
+        return text
     except Exception as e:
         return f"Error: {e}"
 
@@ -97,32 +270,123 @@ def append_file(file_path: str, content: str) -> str:
         return f"Error: {e}"
 
 def file_stats(file_path: str) -> str:
+    """Line, word and character counts from fixed-size chunks of decoded text"""
     try:
         safe_path = sanitize_path(file_path)
         if os.path.exists(safe_path):
-            with open(safe_path, "r", encoding="utf-8") as f:
-                text = f.read()
-            lines = len(text.splitlines())
-            words = len(text.split())
-            chars = len(text)
+            lines = words = chars = 0
+            last = ""
+            with open(safe_path, "r", encoding="utf-8", errors="replace") as f:
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    chars += len(chunk)
+                    lines += sum(chunk.count(c) for c in _LINE_BREAKS)
+                    words += len(chunk.split())
+                    if last and not last.isspace() and not chunk[0].isspace():
+                        words -= 1  # a word split across the chunk boundary
+                    last = chunk[-1]
+            if last and last not in _LINE_BREAKS:
+                lines += 1  # final line without a trailing newline
             return f"Lines: {lines}, Words: {words}, Characters: {chars}"
         return "File not found."
     except Exception as e:
         return f"Error: {e}"
 
-def search_in_file(file_path: str, keyword: str) -> str:
+def _line_matchers(query: str):
+    """(finder, line check) for '/regex/' or space-separated keywords that must all appear.
+
+    finder locates candidate lines anywhere in a chunk of text; line check
+    confirms the whole query on the single line that contains the hit.
+    """
+    query = query.strip()
+    if len(query) > 2 and query.startswith("/") and query.endswith("/"):
+        pattern = re.compile(query[1:-1], re.IGNORECASE | re.MULTILINE)
+        return pattern.search, pattern.search
+    keywords = query.split()
+    finder = re.compile(re.escape(keywords[0]), re.IGNORECASE).search
+    if len(keywords) == 1:
+        return finder, lambda line: True
+    lookaheads = "".join(f"(?=.*{re.escape(k)})" for k in keywords[1:])
+    return finder, re.compile(f"^{lookaheads}", re.IGNORECASE).search
+
+def _scan_lines(f, finder, line_check):
+    """Yield (line number, line) for matching lines, searching whole chunks at a time"""
+    line_no = 1
+    carry = ""
+    while True:
+        data = f.read(CHUNK_SIZE)
+        text = carry + data
+        cut = text.rfind("\n") + 1
+        if data and cut == 0 and len(text) < 4 * CHUNK_SIZE:
+            carry = text  # no complete line yet
+            continue
+        if data and cut:
+            chunk, carry = text[:cut], text[cut:]
+        else:
+            chunk, carry = text, ""  # end of file, or one enormous line
+        pos = counted = 0
+        while True:
+            match = finder(chunk, pos)
+            if not match or match.start() >= len(chunk):
+                break  # an empty match past the last newline is not a line
+            start = chunk.rfind("\n", 0, match.start()) + 1
+            end = chunk.find("\n", match.start())
+            end = len(chunk) if end == -1 else end + 1
+            line_no += chunk.count("\n", counted, start)
+            counted = start
+            line = chunk[start:end]
+            if line_check(line):
+                yield line_no, line
+            pos = end
+        line_no += chunk.count("\n", counted)
+        if not data:
+            return
+
+def search_in_file(file_path: str, query: str, max_matches: int = MAX_MATCHES) -> str:
     try:
         safe_path = sanitize_path(file_path)
         if os.path.exists(safe_path):
-            with open(safe_path, "r", encoding="utf-8") as f:
-                matches = [line.strip() for line in f if keyword.lower() in line.lower()]
+            try:
+                finder, line_check = _line_matchers(query)
+            except re.error as e:
+                return f"Invalid pattern: {e}"
+            matches = []
+            truncated = False
+            with open(safe_path, "r", encoding="utf-8", errors="replace") as f:
+                for number, line in _scan_lines(f, finder, line_check):
+                    if len(matches) == max_matches:
+                        truncated = True
+                        break
+                    matches.append((number, line))
             if matches:
-                return f"Found lines:\n" + "\n".join(matches)
-            return f"No matches for '{keyword}'"
+                result = "Found lines:\n" + "\n".join(f"L{n}: {_clip(line).strip()}" for n, line in matches)
+                if truncated:
+                    result += f"\n... stopped after {max_matches} matches"
+                return result
+            return f"No matches for '{query}'"
         return "File not found."
     except Exception as e:
         return f"Error: {e}"
 
+def _file_index():
+    from tools.file_index import get_index
+    index = get_index()
+    index.start()
+    return index
+
+def find_all(query: str) -> str:
+    """Lines anywhere in the workspace containing every keyword, from the file index"""
+    index = _file_index()
+    results = index.search(query)
+    if not results:
+        if not index.ready:
+            return "Still indexing the workspace, try again in a moment."
+        return f"No matches for '{query}'"
+    lines = [f"{path}:L{line}: {text}" for path, line, text in index.snippets(results)]
+    return "Found in files:\n" + "\n".join(lines)
+
 # ---------------- RANDOM / FUN ----------------
 def random_number(start=0, end=100) -> str:
     return f"Random number: {random.randint(start, end)}"
@@ -152,11 +416,30 @@ def search_and_replace(text: str, search: str, replace: str) -> str:
     return text.replace(search, replace)
 
 # ---------------- REMINDERS / TIMER ----------------
+def _reminders():
+    from tools.reminders import get_scheduler
+    scheduler = get_scheduler()
+    scheduler.start()
+    return scheduler
+
 def set_timer(seconds: int, message: str):
-    def notify():
-        print(f"[TIMER] {message}")
-    threading.Timer(seconds, notify).start()
-    return f"Timer set for {seconds} seconds."
+    reminder = _reminders().add_in(seconds, message)
+    return f"Timer #{reminder.id} set for {seconds} seconds."
+
+def list_reminders() -> str:
+    pending = _reminders().pending()
+    if not pending:
+        return "No pending reminders."
+    return "Pending reminders:\n" + "\n".join(r.describe() for r in pending)
+
+def cancel_reminder(reminder_id: str) -> str:
+    try:
+        rid = int(reminder_id.strip().lstrip('#'))
+    except ValueError:
+        return "Please give the reminder number, e.g. cancel 3"
+    if _reminders().cancel(rid):
+        return f"Reminder #{rid} cancelled."
+    return f"No pending reminder #{rid}."
 
 # ---------------- UNIT CONVERSION ----------------
 def convert_length(value: float, from_unit: str, to_unit: str) -> float:
@@ -179,23 +462,47 @@ def convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
     return None
 
 # ---------------- NOTES / TODO ----------------
-NOTES_FILE = os.path.join(os.path.dirname(__file__), "notes.txt")
+def get_notes():
+    from tools.notes_store import get_store
+    return get_store()
 
 def add_note(note: str) -> str:
-    return append_file(NOTES_FILE, note)
+    note_id = get_notes().add(note)
+    return f"Note #{note_id} saved."
 
-def read_notes() -> str:
-    return read_file(NOTES_FILE)
+def read_notes(before: str = "") -> str:
+    """Newest notes, or the ones older than note #before"""
+    try:
+        before_id = int(before.strip().lstrip('#')) if before.strip() else None
+    except ValueError:
+        return "Please give a note number to continue from, e.g. readnotes 41"
+    notes, more = get_notes().page(before_id)
+    if not notes:
+        return "No notes found." if before_id is None else f"No notes older than #{before_id}."
+    lines = [note.describe() for note in notes]
+    if more:
+        lines.append(f"... older: readnotes {notes[-1].id}")
+    title = "Notes" if before_id is None else f"Notes older than #{before_id}"
+    return f"{title}:\n" + "\n".join(lines)
+
+def search_notes(query: str) -> str:
+    notes = get_notes().search(query)
+    if not notes:
+        return f"No notes matching '{query}'"
+    return "Matching notes:\n" + "\n".join(note.describe() for note in notes)
+
+def delete_note(note_id: str) -> str:
+    try:
+        nid = int(note_id.strip().lstrip('#'))
+    except ValueError:
+        return "Please give the note number, e.g. deletenote 3"
+    if get_notes().delete(nid):
+        return f"Note #{nid} deleted."
+    return f"No note #{nid}."
 
 def delete_notes() -> str:
-    try:
-        safe_path = sanitize_path(NOTES_FILE)
-        if os.path.exists(safe_path):
-            os.remove(safe_path)
-            return "All notes deleted."
-        return "No notes found."
-    except Exception as e:
-        return f"Error: {e}"
+    count = get_notes().clear()
+    return f"All notes deleted ({count})." if count else "No notes found."
 
 # ---------------- JOKES & FACTS (MIXED ONLINE/OFFLINE) ----------------
 LOCAL_JOKES = [
@@ -214,8 +521,10 @@ LOCAL_FACTS = [
     "A day on Venus is longer than a year on Venus."
 ]
 
-def get_online_joke():
-    """Fetch a joke from online API with fallback to local jokes"""
+API_NINJAS_KEY = os.getenv("API_NINJAS_KEY", "")
+
+def fetch_joke() -> Optional[str]:
+    """Fetch one joke from the online APIs, or None if they are unreachable"""
     try:
         # Try JokeAPI first
         response = requests.get("https://v2.jokeapi.dev/joke/Any?safe-mode", timeout=2)
@@ -233,14 +542,12 @@ def get_online_joke():
         if response.status_code == 200:
             return response.text
             
-    except (requests.RequestException, KeyError):
+    except (requests.RequestException, KeyError, ValueError):
         pass
-    
-    # If all online attempts fail, use local jokes
-    return random.choice(LOCAL_JOKES)
+    return None
 
-def get_online_fact():
-    """Fetch a fact from online API with fallback to local facts"""
+def fetch_fact() -> Optional[str]:
+    """Fetch one fact from the online APIs, or None if they are unreachable"""
     try:
         # Try uselessfacts API
         response = requests.get("https://uselessfacts.jsph.pl/random.json?language=en", timeout=2)
@@ -248,26 +555,42 @@ def get_online_fact():
             data = response.json()
             return data['text']
             
-        # Fallback to api-ninjas
-        response = requests.get("https://api.api-ninjas.com/v1/facts", 
-                               headers={"X-Api-Key": "YOUR_API_KEY"}, 
-                               timeout=2)
-        if response.status_code == 200 and response.json():
-            return response.json()[0]['fact']
+        # Fallback to api-ninjas (only when a key is configured)
+        if API_NINJAS_KEY:
+            response = requests.get("https://api.api-ninjas.com/v1/facts", 
+                                   headers={"X-Api-Key": API_NINJAS_KEY}, 
+                                   timeout=2)
+            if response.status_code == 200 and response.json():
+                return response.json()[0]['fact']
             
-    except (requests.RequestException, KeyError):
+    except (requests.RequestException, KeyError, ValueError, IndexError):
         pass
-    
-    # If all online attempts fail, use local facts
-    return random.choice(LOCAL_FACTS)
+    return None
+
+def get_online_joke():
+    """Fetch a joke from online API with fallback to local jokes"""
+    return fetch_joke() or random.choice(LOCAL_JOKES)
+
+def get_online_fact():
+    """Fetch a fact from online API with fallback to local facts"""
+    return fetch_fact() or random.choice(LOCAL_FACTS)
+
+# Pre-fetched buffers so "joke"/"fact" never wait on the network
+JOKE_BUFFER = PrefetchBuffer("jokes", fetch_joke)
+FACT_BUFFER = PrefetchBuffer("facts", fetch_fact)
+
+def start_prefetch():
+    """Start the background refill threads for jokes and facts"""
+    JOKE_BUFFER.start()
+    FACT_BUFFER.start()
 
 def random_joke() -> str:
-    """Get a random joke (online with offline fallback)"""
-    return get_online_joke()
+    """Get a random joke (pre-fetched with offline fallback)"""
+    return JOKE_BUFFER.pop() or random.choice(LOCAL_JOKES)
 
 def random_fact() -> str:
-    """Get a random fact (online with offline fallback)"""
-    return get_online_fact()
+    """Get a random fact (pre-fetched with offline fallback)"""
+    return FACT_BUFFER.pop() or random.choice(LOCAL_FACTS)
 
 # ---------------- MINI SELF-AWARENESS (SIMPLIFIED HELP) ----------------
 def mini_help() -> str:
@@ -279,6 +602,7 @@ I'm Mini! Just say the keyword + your request.
   • define <word> → word definition
   • synonyms <word> → synonyms
   • antonyms <word> → antonyms
+  • word <word> → definition + synonyms + antonyms
   • translate <text> to <lang> → translate text
 
 🔍 SEARCH:
@@ -293,15 +617,22 @@ I'm Mini! Just say the keyword + your request.
 
 📝 NOTES:
   • addnote [text] → save note
-  • readnotes → show notes
+  • readnotes [id] → show notes, newest first (older than note #id)
+  • searchnotes [words] → find notes
+  • deletenote [id] → delete one note
   • deletenotes → clear all notes
 
 ⏰ REMINDERS:
   • timer [seconds] [message] → set timer
+  • remind me 5:30 pm (message) → reminder at a time
+  • reminders → list pending reminders
+  • cancel [id] → cancel a reminder
 
 🧮 MATH:
   • math [expression] → calculate
   • calculate [expression] → calculate
+  • math [expression] for x in [a]..[b] step [s] → values over a range
+  • table [expression] for x in [a]..[b] step [s] → table of values (table 7 → times table)
 
 📏 CONVERSIONS:
   • convertlength [value] [from] [to]
@@ -314,6 +645,7 @@ I'm Mini! Just say the keyword + your request.
   • coin → coin toss
   • dice → dice roll
   • fact → random fact
+  • joke → random joke
 
 🔤 TEXT:
   • count [text] → word count
@@ -322,15 +654,17 @@ I'm Mini! Just say the keyword + your request.
   • replace [text] [search] [replace]
 
 📁 FILES:
-  • read [file] → read file
+  • read [file] [head N | tail N | 10-20] → read part of a file
   • write [file] [text] → write file
   • append [file] [text] → append to file
   • stats [file] → file statistics
-  • searchfile [file] [keyword] → search in file
+  • searchfile [file] [words | /regex/] → matching lines with numbers
+  • findall [words] → lines containing the words in any workspace file
 
 ❓ HELP:
   • help → show this list
   • about → info about Mini
+  • cachestats [clear] → answer cache hit rate
 """
 
 def about_mini() -> str:
@@ -340,37 +674,6 @@ def about_mini() -> str:
             "set timers, convert units, translate text, and much more. "
             "Just ask me anything or say 'help' for available commands.")
 
-# ---------------- COMMAND MAPPING ----------------
-COMMAND_MAPPINGS = {
-    "time": lambda _: current_time(),
-    "date": lambda _: current_date(),
-    "day": lambda _: day_of_week(),
-    "math": simple_math,
-    "read": read_file,
-    "write": write_file,
-    "append": append_file,
-    "stats": file_stats,
-    "searchfile": search_in_file,
-    "random": lambda args: random_number(*map(int, args.split())) if args else random_number(),
-    "choice": lambda args: random_choice(args.split(',')),
-    "coin": lambda _: coin_toss(),
-    "dice": lambda _: dice_roll(),
-    "fact": lambda _: random_fact(),
-    "count": word_count,
-    "reverse": reverse_text,
-    "capitalize": capitalize_text,
-    "replace": lambda args: search_and_replace(*args.split(' ', 2)),
-    "timer": lambda args: set_timer(int(args.split()[0]), ' '.join(args.split()[1:])) if args else "Please specify time and message",
-    "convertlength": lambda args: f"{convert_length(*map(float, args.split()[:2]), args.split()[2])}" if len(args.split()) >= 3 else "Invalid format",
-    "convertweight": lambda args: f"{convert_weight(*map(float, args.split()[:2]), args.split()[2])}" if len(args.split()) >= 3 else "Invalid format",
-    "converttemp": lambda args: f"{convert_temperature(*map(float, args.split()[:2]), args.split()[2])}" if len(args.split()) >= 3 else "Invalid format",
-    "addnote": add_note,
-    "readnotes": read_notes,
-    "deletenotes": delete_notes,
-    "help": lambda _: mini_help(),
-    "about": lambda _: about_mini()
-}
-
 # ---------------- NATURAL QUERY HANDLER (EXPANDED) ----------------
 def handle_natural_query(query: str) -> Optional[str]:
     """Handle natural language queries using keyword + free-form matching"""
@@ -391,6 +694,10 @@ def handle_natural_query(query: str) -> Optional[str]:
         return f"Today is {day_of_week()}"
 
     # ---------------- NOTES ----------------
+    search_match = re.search(r'\b(?:search|find|khojo)\s+notes?\s+(?:for\s+)?(.+)', query_lower)
+    if search_match:
+        return search_notes(search_match.group(1).strip())
+
     note_match = re.search(r'\b(note|likho|likh do|yaad rakhna)\b(.*)', query_lower)
     if note_match:
         note_text = note_match.group(2).strip()
@@ -422,11 +729,10 @@ def handle_natural_query(query: str) -> Optional[str]:
         now = datetime.now()
         target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
         if target < now:
-            target = target.replace(day=now.day + 1)  # push to next day if already passed
+            target += timedelta(days=1)  # push to next day if already passed
 
-        seconds = max(1, int((target - now).total_seconds()))
-        set_timer(seconds, message)
-        return f"Reminder set for {target.strftime('%I:%M %p')} with message: {message}"
+        reminder = _reminders().add(target.timestamp(), message)
+        return f"Reminder #{reminder.id} set for {target.strftime('%I:%M %p')} with message: {message}"
 
     # ---------------- MATH ----------------
     if any(k in query_lower for k in ['sum', 'add', '+', 'jod', 'jama']):
@@ -483,6 +789,8 @@ def handle_natural_query(query: str) -> Optional[str]:
         return dice_roll()
     if any(k in query_lower for k in ['fact', 'tathya', 'rochak jankari']):
         return random_fact()
+    if any(k in query_lower for k in ['joke', 'chutkula', 'mazak']):
+        return random_joke()
 
     # ---------------- TEXT UTILITIES ----------------
     if any(k in query_lower for k in ['word count', 'count words', 'shabd ginti']):
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import threading
+import logging
+from collections import deque
+from typing import Callable, Optional
+
+logger = logging.getLogger('Prefetch')
+
+
+class PrefetchBuffer:
+    """Bounded ring buffer of pre-fetched items, topped up by a background thread.
+
+    Readers call pop() which never touches the network. When the buffer falls
+    below the low-water mark the refill thread is woken and calls `fetcher`
+    until the buffer is full again. Contents are persisted to `store_path`
+    so a restart starts with a warm buffer.
+    """
+
+    def __init__(self, name: str, fetcher: Callable[[], Optional[str]],
+                 capacity: int = 20, low_water: int = 5,
+                 store_path: Optional[str] = None, retry_delay: float = 30.0):
+        self.name = name
+        self.fetcher = fetcher
+        self.capacity = capacity
+        self.low_water = low_water
+        self.store_path = store_path or os.path.join("data", f"prefetch_{name}.json")
+        self.retry_delay = retry_delay
+        self.items = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._dirty = False
+        self._thread = None
+        self.load()
+
+    # ---------------- PERSISTENCE ----------------
+    def load(self):
+        if not os.path.exists(self.store_path):
+            return
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            with self._lock:
+                self.items.extend(item for item in saved if isinstance(item, str))
+        except Exception as e:
+            logger.error(f"Error loading {self.name} buffer: {e}")
+
+    def save(self):
+        with self._lock:
+            snapshot = list(self.items)
+            self._dirty = False
+        try:
+            directory = os.path.dirname(self.store_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.store_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.store_path)
+        except Exception as e:
+            logger.error(f"Error saving {self.name} buffer: {e}")
+
+    # ---------------- READ PATH ----------------
+    def pop(self) -> Optional[str]:
+        """Take the oldest buffered item, or None if the buffer is empty"""
+        with self._lock:
+            item = self.items.popleft() if self.items else None
+            self._dirty = True
+            low = len(self.items) < self.low_water
+        if low:
+            self._wake.set()
+        return item
+
+    def __len__(self):
+        return len(self.items)
+
+    # ---------------- REFILL THREAD ----------------
+    def start(self):
+        """Start the refill thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._refill_loop, name=f"prefetch-{self.name}", daemon=True
+        )
+        self._thread.start()
+        self._wake.set()
+
+    def _refill_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            failed = self.refill()
+            if self._dirty:
+                self.save()
+            if failed:
+                # Back off so an outage doesn't turn into a busy loop
+                time.sleep(self.retry_delay)
+                if len(self.items) < self.low_water:
+                    self._wake.set()
+
+    def refill(self) -> bool:
+        """Fetch until full. Returns True if the fetcher gave up early."""
+        attempts = 0
+        while len(self.items) < self.capacity:
+            attempts += 1
+            if attempts > self.capacity * 2:
+                # Source keeps repeating itself; try again later
+                return True
+            try:
+                item = self.fetcher()
+            except Exception as e:
+                logger.error(f"Error prefetching {self.name}: {e}")
+                item = None
+            if not item:
+                return True
+            with self._lock:
+                if item not in self.items:
+                    self.items.append(item)
+                    self._dirty = True
+        return False
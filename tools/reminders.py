@@ -0,0 +1,172 @@
+import os
+import time
+import heapq
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional
+
+logger = logging.getLogger('Reminders')
+
+DEFAULT_DB_PATH = os.path.join("data", "reminders.sqlite")
+
+
+class Reminder:
+    __slots__ = ("id", "due", "message", "created")
+
+    def __init__(self, id: int, due: float, message: str, created: float):
+        self.id = id
+        self.due = due
+        self.message = message
+        self.created = created
+
+    @property
+    def late(self) -> bool:
+        """Fired noticeably after its due time (e.g. Mini was not running)"""
+        return time.time() - self.due > 60
+
+    def describe(self) -> str:
+        when = datetime.fromtimestamp(self.due)
+        fmt = "%I:%M %p" if when.date() == datetime.now().date() else "%d %b %I:%M %p"
+        return f"#{self.id} {when.strftime(fmt)} - {self.message}"
+
+
+class ReminderScheduler:
+    """One thread serving every timer and reminder from a min-heap of due times.
+
+    Pending reminders live in SQLite so they survive restarts; start()
+    reloads them, and any that fell due while Mini was off fire at once.
+    Due reminders are handed to every subscribed callback (console, TTS,
+    Kivy UI); with no subscribers they are printed.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS reminders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                due REAL NOT NULL,
+                message TEXT NOT NULL,
+                created REAL NOT NULL
+            )
+        ''')
+        self.conn.commit()
+        self._cond = threading.Condition()
+        self._heap = []  # (due, id); cancelled ids are skipped when popped
+        self._pending = {}
+        self._subscribers: List[Callable[[Reminder], None]] = []
+        self._running = False
+        self._thread = None
+        for row in self.conn.execute("SELECT id, due, message, created FROM reminders"):
+            self._track(Reminder(*row))
+
+    def _track(self, reminder: Reminder):
+        self._pending[reminder.id] = reminder
+        heapq.heappush(self._heap, (reminder.due, reminder.id))
+
+    # ---------------- SUBSCRIBERS ----------------
+    def subscribe(self, callback: Callable[[Reminder], None]):
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Reminder], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _deliver(self, reminder: Reminder):
+        if not self._subscribers:
+            print(f"[TIMER] {reminder.message}")
+            return
+        for callback in list(self._subscribers):
+            try:
+                callback(reminder)
+            except Exception as e:
+                logger.error(f"Reminder callback failed: {e}")
+
+    # ---------------- API ----------------
+    def add(self, due: float, message: str) -> Reminder:
+        """Schedule message at the given epoch time"""
+        now = time.time()
+        with self._cond:
+            with self.conn:
+                cur = self.conn.execute(
+                    "INSERT INTO reminders (due, message, created) VALUES (?, ?, ?)", (due, message, now)
+                )
+            reminder = Reminder(cur.lastrowid, due, message, now)
+            self._track(reminder)
+            self._cond.notify()
+        return reminder
+
+    def add_in(self, seconds: float, message: str) -> Reminder:
+        return self.add(time.time() + seconds, message)
+
+    def cancel(self, reminder_id: int) -> bool:
+        with self._cond:
+            if self._pending.pop(reminder_id, None) is None:
+                return False
+            with self.conn:
+                self.conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+            self._cond.notify()
+        return True
+
+    def pending(self) -> List[Reminder]:
+        with self._cond:
+            return sorted(self._pending.values(), key=lambda r: r.due)
+
+    # ---------------- MAIN LOOP ----------------
+    def _pop_due(self) -> Optional[Reminder]:
+        """Next due reminder, or None after waiting until one might be"""
+        with self._cond:
+            while self._heap and self._heap[0][1] not in self._pending:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                self._cond.wait()
+                return None
+            due, reminder_id = self._heap[0]
+            wait = due - time.time()
+            if wait > 0:
+                self._cond.wait(timeout=wait)
+                return None
+            heapq.heappop(self._heap)
+            return self._pending.pop(reminder_id)
+
+    def _loop(self):
+        while self._running:
+            reminder = self._pop_due()
+            if reminder is not None:
+                self._deliver(reminder)
+                # Only now: a crash mid-delivery fires the reminder again on restart instead of losing it
+                with self._cond, self.conn:
+                    self.conn.execute("DELETE FROM reminders WHERE id = ?", (reminder.id,))
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._loop, name="reminders", daemon=True)
+        self._thread.start()
+        logger.info(f"Reminder scheduler started with {len(self._pending)} pending")
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> ReminderScheduler:
+    """Shared scheduler (not started: subscribe first, then call start())"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ReminderScheduler()
+        return _scheduler
@@ -0,0 +1,157 @@
+import time
+import atexit
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Protocol
+
+logger = logging.getLogger('BrowserPool')
+
+# Number of resources the page has requested so far; stable count == network idle
+_RESOURCE_COUNT_JS = "return window.performance ? performance.getEntriesByType('resource').length : 0"
+
+
+class BrowserDriver(Protocol):
+    """What the pool needs from a driver.
+
+    Selenium's WebDriver satisfies it structurally; a fake for tests only
+    has to provide these members, without subclassing anything.
+    """
+
+    page_source: str
+
+    def set_page_load_timeout(self, seconds: float) -> None: ...
+
+    def get(self, url: str) -> None: ...
+
+    def execute_script(self, script: str) -> Any: ...
+
+    def quit(self) -> None: ...
+
+
+class _Slot:
+    __slots__ = ("driver", "pages")
+
+    def __init__(self, driver: BrowserDriver):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """Pool of long-lived headless browsers, recycled after N pages or a crash.
+
+    factory returns a new BrowserDriver, e.g. a Selenium WebDriver.
+    """
+
+    def __init__(self, factory: Callable[[], BrowserDriver], size=2, max_pages=50, ready_timeout=10.0,
+                 idle_time=0.5, poll_interval=0.1):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.ready_timeout = ready_timeout
+        self.idle_time = idle_time
+        self.poll_interval = poll_interval
+        self._idle = []  # stack, most recently used last: warmest caches
+        self._cond = threading.Condition()
+        self._created = 0
+        self._closed = False
+
+    # ---------------- CHECKOUT ----------------
+    def _checkout(self, timeout):
+        """An idle slot, or a new one while under size; waits up to timeout for either"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser free after {timeout}s")
+                self._cond.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        try:
+            return _Slot(self.factory())
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self):
+        """Give up one slot of capacity and wake a waiter to fill it"""
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def _discard(self, slot):
+        self._release()
+        try:
+            slot.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting driver: {e}")
+
+    def _checkin(self, slot, broken):
+        if broken or self._closed or slot.pages >= self.max_pages:
+            self._discard(slot)
+            return
+        with self._cond:
+            self._idle.append(slot)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout=30):
+        """Borrow a warm driver for one page"""
+        slot = self._checkout(timeout)
+        broken = False
+        try:
+            yield slot.driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            slot.pages += 1
+            self._checkin(slot, broken)
+
+    # ---------------- RENDERING ----------------
+    def wait_until_ready(self, driver: BrowserDriver):
+        """Wait for document.readyState == 'complete' and no new requests for idle_time"""
+        deadline = time.monotonic() + self.ready_timeout
+        last_count, stable_since = -1, None
+        while time.monotonic() < deadline:
+            if driver.execute_script("return document.readyState") == "complete":
+                count = driver.execute_script(_RESOURCE_COUNT_JS)
+                now = time.monotonic()
+                if count != last_count:
+                    last_count, stable_since = count, now
+                elif now - stable_since >= self.idle_time:
+                    return True
+            time.sleep(self.poll_interval)
+        return False
+
+    def render(self, url, timeout=15):
+        """Load url in a pooled browser and return the rendered HTML"""
+        with self.driver() as driver:
+            driver.set_page_load_timeout(timeout)
+            driver.get(url)
+            if not self.wait_until_ready(driver):
+                logger.info(f"Page not idle after {self.ready_timeout}s, using current DOM: {url}")
+            return driver.page_source
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for slot in idle:
+            self._discard(slot)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(factory, **kwargs):
+    """Process-wide pool, created on first use and closed at exit"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(factory, **kwargs)
+            atexit.register(_pool.close)
+        return _pool
@@ -2,13 +2,24 @@ import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-import time
 import logging
 import os
 from pathlib import Path
+from . import parser
+from .browser_pool import get_browser_pool
+from .page_cache import PageCache
 
 logger = logging.getLogger('Crawler')
 
+BROWSER_POOL_SIZE = int(os.getenv("MINI_BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_PAGES = int(os.getenv("MINI_BROWSER_MAX_PAGES", "50"))
+PAGE_CACHE_DIR = os.getenv("MINI_PAGE_CACHE_DIR", os.path.join("data", "page_cache"))
+DEFAULT_MAX_AGE = int(os.getenv("MINI_PAGE_MAX_AGE", "900"))  # seconds a cached page counts as fresh
+MAX_PAGE_CHARS = int(os.getenv("MINI_MAX_PAGE_CHARS", "500000"))  # text budget per parsed page
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+
+_page_cache = None
+
 def _driver_service():
     """Locate ChromeDriver with platform-specific paths"""
     base = Path(__file__).resolve().parent.parent
@@ -23,32 +34,110 @@ def _driver_service():
             return Service(str(path))
     return None  # Fallback to Selenium Manager
 
+def _make_chrome_driver():
+    """Start a headless Chrome for the browser pool"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--window-size=1280,800")
+    
+    service = _driver_service()
+    if service:
+        return webdriver.Chrome(service=service, options=chrome_options)
+    return webdriver.Chrome(options=chrome_options)
+
 def fetch_html(url, use_js=False, timeout=15):
     try:
         if not use_js:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'}
+            headers = {'User-Agent': USER_AGENT}
             response = requests.get(url, headers=headers, timeout=timeout)
             response.raise_for_status()
             return response.text
         else:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless=new")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--window-size=1280,800")
-            
-            service = _driver_service()
-            if service:
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-            else:
-                driver = webdriver.Chrome(options=chrome_options)
-                
-            driver.set_page_load_timeout(timeout)
-            driver.get(url)
-            time.sleep(2.5)  # Wait for JS execution
-            html = driver.page_source
-            driver.quit()
-            return html
+            pool = get_browser_pool(_make_chrome_driver, size=BROWSER_POOL_SIZE,
+                                    max_pages=BROWSER_MAX_PAGES)
+            return pool.render(url, timeout=timeout)
+    except Exception as e:
+        logger.error(f"Error fetching {url}: {str(e)}")
+        return None
+
+# ---------------- CACHED FETCH ----------------
+class Page:
+    """A fetched page's parsed text; the raw HTML is loaded from the cache on demand"""
+    def __init__(self, url, text, entry=None, html=None, from_cache=False):
+        self.url = url
+        self.text = text
+        self.entry = entry
+        self.from_cache = from_cache
+        self._html = html
+
+    @property
+    def html(self):
+        if self._html is None and self.entry is not None:
+            self._html = get_page_cache().load_html(self.entry)
+        return self._html
+
+def get_page_cache():
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = PageCache(PAGE_CACHE_DIR)
+    return _page_cache
+
+def is_fresh(url, max_age):
+    """True if url is in the page cache and younger than max_age seconds"""
+    entry = get_page_cache().get(url)
+    return entry is not None and entry.age() < max_age
+
+def _cached_page(cache, entry):
+    text = cache.load_text(entry)
+    if text is None:
+        return None
+    return Page(entry.url, text, entry=entry, from_cache=True)
+
+def fetch_page(url, use_js=False, max_age=None, timeout=15):
+    """Fetch and parse url through the page cache.
+
+    A fresh cache hit or a 304 from conditional revalidation returns the
+    stored text without downloading or parsing the page again.
+    """
+    max_age = DEFAULT_MAX_AGE if max_age is None else max_age
+    cache = get_page_cache()
+    entry = cache.get(url)
+    
+    if entry and entry.age() < max_age:
+        page = _cached_page(cache, entry)
+        if page:
+            return page
+    
+    try:
+        etag = last_modified = None
+        if not use_js:
+            headers = {'User-Agent': USER_AGENT}
+            if entry and entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry and entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+            response = requests.get(url, headers=headers, timeout=timeout)
+            if response.status_code == 304 and entry:
+                cache.touch(url)
+                page = _cached_page(cache, entry)
+                if page:
+                    return page
+                # Cached body went missing; fetch it unconditionally
+                response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=timeout)
+            response.raise_for_status()
+            html = response.text
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+        else:
+            html = fetch_html(url, use_js=True, timeout=timeout)
+            if html is None:
+                return None
+        
+        text = parser.parse_html(html, max_chars=MAX_PAGE_CHARS)
+        entry = cache.store(url, html, text, etag=etag, last_modified=last_modified)
+        return Page(url, text, entry=entry, html=html)
     except Exception as e:
         logger.error(f"Error fetching {url}: {str(e)}")
-        return None
\ No newline at end of file
+        return None
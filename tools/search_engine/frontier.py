@@ -0,0 +1,185 @@
+import os
+import math
+import json
+import hashlib
+import logging
+import tempfile
+from collections import deque
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+logger = logging.getLogger('Frontier')
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = frozenset(["utm_source", "utm_medium", "utm_campaign", "utm_term",
+                             "utm_content", "fbclid", "gclid", "ref", "ref_src"])
+SKIP_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".pdf", ".zip",
+                   ".mp3", ".mp4", ".css", ".js", ".ico", ".xml", ".rss")
+
+
+def normalize_url(url, base=None):
+    """Absolute, canonical http(s) URL, or None if it shouldn't be crawled"""
+    if base:
+        url = urljoin(base, url)
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    host = parts.netloc.lower()
+    if host.endswith(":80") and parts.scheme == "http":
+        host = host[:-3]
+    elif host.endswith(":443") and parts.scheme == "https":
+        host = host[:-4]
+    path = parts.path or "/"
+    if path.lower().endswith(SKIP_EXTENSIONS):
+        return None
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if k.lower() not in TRACKING_PARAMS))
+    return urlunsplit((parts.scheme, host, path, query, ""))  # fragment dropped
+
+
+class _LinkExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            for name, value in attrs:
+                if name == "href" and value:
+                    self.links.append(value)
+
+
+def extract_links(html, base_url, same_host=True):
+    """Normalised links on a page, in order, optionally limited to base_url's host"""
+    extractor = _LinkExtractor()
+    try:
+        extractor.feed(html)
+        extractor.close()
+    except Exception as e:
+        logger.debug(f"Link extraction stopped early on {base_url}: {e}")
+    host = urlsplit(base_url).netloc.lower()
+    links = []
+    for href in extractor.links:
+        url = normalize_url(href, base=base_url)
+        if url and (not same_host or urlsplit(url).netloc == host):
+            links.append(url)
+    return links
+
+
+class BloomFilter:
+    """Fixed-size set of seen URLs: no false negatives, ~error_rate false positives"""
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        """Add item; returns True if it was (probably) already present"""
+        present = True
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] >> bit & 1:
+                present = False
+                self.bits[byte] |= 1 << bit
+        return present
+
+    def __contains__(self, item):
+        return all(self.bits[pos // 8] >> (pos % 8) & 1 for pos in self._positions(item))
+
+
+class Frontier:
+    """Breadth-first queue of (url, depth) for one seed with a bounded memory footprint.
+
+    URLs are de-duplicated with a BloomFilter. Once more than memory_cap
+    entries are queued, new ones are appended to a spill file on disk and
+    read back in order after the in-memory part drains.
+    """
+
+    def __init__(self, seed_url, max_depth=2, max_pages=50, memory_cap=1000,
+                 bloom_capacity=100000, spill_dir=None):
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.memory_cap = memory_cap
+        self.seen = BloomFilter(capacity=bloom_capacity)
+        self.queue = deque()
+        self.spill_dir = spill_dir
+        self._spill_path = None
+        self._spill_write = None
+        self._spill_read = None
+        self._spilled = 0
+        self.popped = 0
+        seed = normalize_url(seed_url)
+        if seed:
+            self.seen.add(seed)
+            self.queue.append((seed, 0))
+
+    # ---------------- SPILL ----------------
+    def _spill(self, item):
+        if self._spill_write is None:
+            fd, self._spill_path = tempfile.mkstemp(prefix="frontier-", suffix=".jsonl", dir=self.spill_dir)
+            self._spill_write = os.fdopen(fd, "w", encoding="utf-8")
+            self._spill_read = open(self._spill_path, "r", encoding="utf-8")
+        self._spill_write.write(json.dumps(item) + "\n")
+        self._spilled += 1
+
+    def _unspill(self):
+        """Refill memory from the spill file, oldest first"""
+        self._spill_write.flush()
+        while self._spilled and len(self.queue) < self.memory_cap:
+            line = self._spill_read.readline()
+            if not line:
+                break
+            self.queue.append(tuple(json.loads(line)))
+            self._spilled -= 1
+
+    def close(self):
+        for f in (self._spill_write, self._spill_read):
+            if f is not None:
+                f.close()
+        if self._spill_path and os.path.exists(self._spill_path):
+            os.remove(self._spill_path)
+        self._spill_write = self._spill_read = self._spill_path = None
+
+    # ---------------- QUEUE ----------------
+    def add_links(self, links, depth):
+        """Queue links found on a page at `depth` (they will be at depth + 1)"""
+        if depth + 1 > self.max_depth:
+            return 0
+        added = 0
+        for url in links:
+            if self.seen.add(url):
+                continue
+            item = (url, depth + 1)
+            if self._spilled or len(self.queue) >= self.memory_cap:
+                self._spill(item)  # keep FIFO order: once spilling, everything goes to disk
+            else:
+                self.queue.append(item)
+            added += 1
+        return added
+
+    def pop(self):
+        """Next (url, depth), or None when the queue is empty or the page budget is spent"""
+        if self.popped >= self.max_pages:
+            return None
+        if not self.queue and self._spilled:
+            self._unspill()
+        if not self.queue:
+            return None
+        self.popped += 1
+        return self.queue.popleft()
+
+    def __len__(self):
+        return len(self.queue) + self._spilled
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
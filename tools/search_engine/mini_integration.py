@@ -1,6 +1,11 @@
 import os
-import time
-from . import seed_loader, query_classifier, crawler, parser, search_index
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from . import seed_loader, crawler, parser, search_index
+from .politeness import HostRateLimiter
+from .recrawl_scheduler import RecrawlScheduler
+from .simhash import SimHashIndex, simhash
+from .vector_index import get_vector_index
 import logging
 from pathlib import Path
 
@@ -8,55 +13,207 @@ from pathlib import Path
 logger = logging.getLogger('MiniSearch')
 logger.setLevel(logging.INFO)
 
-def handle_query(user_query):
-    """Main entry point for search queries"""
+# Crawl limits: sites fetch concurrently, so more of them no longer add up
+MAX_SITES = 10
+MAX_CONCURRENCY = 6
+PER_HOST_INTERVAL = 0.5  # seconds between requests to the same host
+QUERY_TIMEOUT = 30  # seconds to wait for all sites of one query
+INDEX_MAX_AGE = 6 * 3600  # seconds an indexed page may answer a query without recrawling
+MIN_INDEX_HITS = 2  # crawl only when the index has fewer fresh hits than this
+
+SEED_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_websites.csv")
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="crawl")
+_host_limiter = HostRateLimiter(min_interval=PER_HOST_INTERVAL)
+_fingerprints = None
+_fingerprints_lock = threading.Lock()
+
+def get_fingerprint_index():
+    """Shared SimHash index of crawled pages, loaded from search_index on first use"""
+    global _fingerprints
+    with _fingerprints_lock:
+        if _fingerprints is None:
+            _fingerprints = SimHashIndex(search_index.load_fingerprints(search_index.DB_PATH))
+        return _fingerprints
+
+def _after_compact(removed_urls):
+    """Keep the page cache and fingerprints in step with index retention"""
+    with _fingerprints_lock:
+        fingerprints = _fingerprints
+    if fingerprints is not None:
+        for url in removed_urls:
+            fingerprints.remove(url)
+    pruned = crawler.get_page_cache().prune(max_age=search_index.RETENTION_DAYS * 86400)
+    logger.info(f"Pruned {pruned} page cache files")
+
+search_index.on_compact(_after_compact)
+
+def _crawl_site(site, user_query, category, abandoned=None):
+    """Fetch, parse and snippet one site. Runs on the crawl pool.
+
+    abandoned is set once the query has stopped waiting; checked before the
+    fetch and after it so a timed-out query stops using workers and browsers.
+    """
+    url = site['website_url']
+    if abandoned is not None and abandoned.is_set():
+        return None
+    logger.info(f"Processing site: {url}")
+    use_js = site['type'] == 'JS'
+    max_age = seed_loader.max_age_seconds(site, crawler.DEFAULT_MAX_AGE)
+    if crawler.is_fresh(url, max_age):
+        # Served from the page cache: no request goes out, so no politeness delay
+        page = crawler.fetch_page(url, use_js=use_js, max_age=max_age)
+    else:
+        with _host_limiter.slot(url):
+            if abandoned is not None and abandoned.is_set():
+                return None  # the politeness wait outlasted the query
+            page = crawler.fetch_page(url, use_js=use_js, max_age=max_age)
+    if not page or (abandoned is not None and abandoned.is_set()):
+        return None
+    text = page.text
+
+    # Near-duplicates skip snippeting and indexing entirely
+    fp = simhash(text)
+    fingerprints = get_fingerprint_index()
+    duplicate = fingerprints.check(url, fp)
+    if duplicate == 'unchanged' and not search_index.has_page(search_index.DB_PATH, url):
+        duplicate = None  # fingerprinted but never stored (e.g. an earlier query timed out)
+    if duplicate == 'unchanged':
+        return {"url": url, "duplicate": duplicate}
+    if duplicate:
+        logger.info(f"Skipping {url}: near-duplicate of {duplicate[1]}")
+        return {"url": url, "duplicate": duplicate}
+
+    snippet = parser.extract_snippet(text, user_query)
+    logger.info(f"Extracted snippet: {snippet[:50]}...")
+    return {
+        "url": url,
+        "snippet": snippet,
+        "category": category,
+        "keywords": site['keywords'],
+        "text": text,
+        "simhash": fp
+    }
+
+def iter_query_results(user_query):
+    """Yield search results as soon as each site has been crawled and parsed"""
+    # Step 1: Load Websites & Classify Query
+    registry = seed_loader.get_registry(SEED_CSV_PATH)
+
+    category = registry.classify(user_query)
+    logger.info(f"Query classified as: {category}")
+
+    # Step 2: Filter Websites for Query
+    relevant_sites = registry.sites_for(category)
+
+    # Initialize database
+    db_path = search_index.DB_PATH
+    search_index.init_db(db_path)
+
+    # Step 3: Answer from the full-text index first
+    hits = search_index.search(user_query, category=category, k=MAX_SITES,
+                               max_age=INDEX_MAX_AGE, db_path=db_path)
+    for hit in hits:
+        yield hit
+    if len(hits) >= MIN_INDEX_HITS:
+        return
+    covered = {hit['url'] for hit in hits}
+
+    # Step 3b: Pages that match by meaning rather than exact words
+    for hit in semantic_search(user_query, category=category, k=MAX_SITES, max_age=INDEX_MAX_AGE):
+        if hit['url'] not in covered:
+            covered.add(hit['url'])
+            hits.append(hit)
+            yield hit
+    if len(hits) >= MIN_INDEX_HITS:
+        return
+
+    # Step 4: Crawl uncovered sites concurrently & stream snippets out as they complete
+    abandoned = threading.Event()
+    futures = {
+        _executor.submit(_crawl_site, site, user_query, category, abandoned): site
+        for site in relevant_sites[:MAX_SITES]
+        if site['website_url'] not in covered
+    }
+    crawled, refreshed = [], []
     try:
-        # Step 1: Load Websites & Classify Query
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        csv_path = os.path.join(base_dir, "seed_websites.csv")
-        seed_websites = seed_loader.load_seed_websites(csv_path)
-        logger.info(f"Loaded {len(seed_websites)} seed websites")
-        
-        category = query_classifier.classify_query(user_query, seed_websites)
-        logger.info(f"Query classified as: {category}")
-
-        # Step 2: Filter Websites for Query
-        relevant_sites = [site for site in seed_websites if site['category'] == category]
-        
-        # Initialize database
-        db_path = os.path.join(base_dir, "search_db.sqlite")
-        search_index.init_db(db_path)
-        
-        # Step 3: Crawl & Extract Snippets
-        results = []
-        for site in relevant_sites[:3]:  # Limit to 3 sites for performance
+        for future in as_completed(futures, timeout=QUERY_TIMEOUT):
+            site = futures[future]
             try:
-                logger.info(f"Processing site: {site['website_url']}")
-                html = crawler.fetch_html(site['website_url'], use_js=(site['type'] == 'JS'))
-                if html:
-                    text = parser.parse_html(html)
-                    snippet = parser.extract_snippet(text, user_query)
-                    logger.info(f"Extracted snippet: {snippet[:50]}...")
-                    
-                    # Store in DB
-                    search_index.store_result(
-                        db_path,
-                        site['website_url'],
-                        category,
-                        snippet,
-                        site['keywords']
-                    )
-                    results.append({
-                        "url": site['website_url'],
-                        "snippet": snippet,
-                        "category": category
-                    })
-                    time.sleep(0.5)  # Reduced rate limiting
+                result = future.result()
             except Exception as e:
                 logger.error(f"Error processing {site['website_url']}: {str(e)}")
                 continue
-        
-        return results if results else []
+            if not result:
+                continue
+            if result.get('duplicate'):
+                if result['duplicate'] == 'unchanged':
+                    refreshed.append(result['url'])
+                continue
+
+            crawled.append(result)
+            yield {k: v for k, v in result.items() if k not in ('keywords', 'text', 'simhash')}
+    except FuturesTimeout:
+        logger.warning(f"Crawl timed out after {QUERY_TIMEOUT}s; returning partial results")
+        abandoned.set()
+        for future in futures:
+            future.cancel()  # queued crawls never start; running ones stop at their next check
+    finally:
+        # Store the whole crawl in one transaction; unchanged pages only get their timestamp bumped.
+        # Fingerprints go in memory only once their pages are stored, or a lost page would be
+        # skipped as 'unchanged' forever.
+        if search_index.store_batch(db_path, crawled, touched=refreshed):
+            fingerprints = get_fingerprint_index()
+            for r in crawled:
+                fingerprints.add(r['url'], r['simhash'])
+        vectors = get_vector_index()
+        if vectors is not None and crawled:
+            # Embedding is CPU work the caller shouldn't wait for
+            _executor.submit(vectors.add_pages, [(r['url'], r['text'], r['category']) for r in crawled])
+
+    # Pages that barely changed are already indexed: answer from their existing entry
+    if refreshed:
+        for hit in search_index.search(user_query, category=category, k=len(refreshed),
+                                       db_path=db_path, urls=refreshed):
+            yield hit
+
+def semantic_search(user_query, category=None, k=5, max_age=None):
+    """Vector-index hits shaped like crawl results; [] without NumPy"""
+    vectors = get_vector_index()
+    if vectors is None:
+        return []
+    try:
+        hits = vectors.search(user_query, k=k, category=category, max_age=max_age)
+    except Exception as e:
+        logger.error(f"Vector search error: {e}")
+        return []
+    return [{
+        "url": hit['url'],
+        "snippet": parser.extract_snippet(hit['text'], user_query),
+        "category": hit['category'],
+        "score": hit['score'],
+        "indexed_at": hit['indexed_at'],
+        "source": hit['source']
+    } for hit in hits]
+
+_recrawler = None
+
+def start_background_recrawl(max_concurrency=4):
+    """Start recrawling seed sites in the background so queries hit a warm index"""
+    global _recrawler
+    if _recrawler is None:
+        _recrawler = RecrawlScheduler(seed_loader.get_registry(SEED_CSV_PATH),
+                                      db_path=search_index.DB_PATH,
+                                      max_concurrency=max_concurrency,
+                                      fingerprints=get_fingerprint_index(),
+                                      vectors=get_vector_index())
+        _recrawler.start()
+    return _recrawler
+
+def handle_query(user_query):
+    """Main entry point for search queries"""
+    try:
+        return list(iter_query_results(user_query))
     except Exception as e:
         logger.error(f"Search engine error: {str(e)}")
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,131 @@
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+import logging
+
+logger = logging.getLogger('PageCache')
+
+
+class CacheEntry:
+    __slots__ = ("url", "content_hash", "etag", "last_modified", "fetched_at", "checked_at")
+
+    def __init__(self, url, content_hash, etag, last_modified, fetched_at, checked_at):
+        self.url = url
+        self.content_hash = content_hash
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.checked_at = checked_at
+
+    def age(self):
+        """Seconds since the entry was last fetched or revalidated"""
+        return time.time() - self.checked_at
+
+
+class PageCache:
+    """Content-addressed, zlib-compressed store of fetched pages.
+
+    Bodies live in objects/<h[:2]>/<h>.html.z and the parsed text next to
+    them as <h>.txt.z, where h is the SHA-256 of the HTML. A small SQLite
+    index maps each URL to its current hash plus the validators
+    (ETag / Last-Modified) needed for conditional revalidation.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                checked_at REAL NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        self.conn.commit()
+
+    def _object_path(self, content_hash, kind):
+        return os.path.join(self.objects_dir, content_hash[:2], f"{content_hash}.{kind}.z")
+
+    def _write_object(self, content_hash, kind, data):
+        path = self._object_path(content_hash, kind)
+        if os.path.exists(path):
+            return  # content-addressed: identical bodies are stored once
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(data.encode("utf-8"), 6))
+        os.replace(tmp_path, path)
+
+    def _read_object(self, content_hash, kind):
+        try:
+            with open(self._object_path(content_hash, kind), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error) as e:
+            logger.warning(f"Missing cache object {content_hash}.{kind}: {e}")
+            return None
+
+    # ---------------- INDEX ----------------
+    def get(self, url):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT url, content_hash, etag, last_modified, fetched_at, checked_at "
+                "FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def load_html(self, entry):
+        return self._read_object(entry.content_hash, "html")
+
+    def load_text(self, entry):
+        return self._read_object(entry.content_hash, "txt")
+
+    def store(self, url, html, text, etag=None, last_modified=None):
+        content_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        self._write_object(content_hash, "html", html)
+        self._write_object(content_hash, "txt", text)
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (url, content_hash, etag, last_modified, now, now)
+            )
+        return CacheEntry(url, content_hash, etag, last_modified, now, now)
+
+    def touch(self, url):
+        """Mark an entry as revalidated (e.g. after a 304)"""
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE pages SET checked_at = ? WHERE url = ?", (time.time(), url))
+
+    def prune(self, max_age=None, grace=3600):
+        """Drop entries not revalidated within max_age seconds (if given), then delete
+        objects no referenced URL needs. Objects younger than grace are kept: store()
+        writes them before their index row. Returns files removed."""
+        with self._lock:
+            if max_age is not None:
+                with self.conn:
+                    self.conn.execute("DELETE FROM pages WHERE checked_at < ?", (time.time() - max_age,))
+            live = {row[0] for row in self.conn.execute("SELECT content_hash FROM pages")}
+        cutoff = time.time() - grace
+        removed = 0
+        for root, _, files in os.walk(self.objects_dir):
+            for name in files:
+                if name.split(".", 1)[0] in live:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
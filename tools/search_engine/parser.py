@@ -1,7 +1,140 @@
 from bs4 import BeautifulSoup
+from functools import lru_cache
+from html import unescape
+from html.parser import HTMLParser
 import re
 
-def parse_html(html):
+SKIP_TAGS = frozenset(["script", "style", "nav", "footer", "noscript"])
+VOID_TAGS = frozenset(["area", "base", "br", "col", "embed", "hr", "img", "input",
+                       "link", "meta", "param", "source", "track", "wbr"])
+# Raw-text elements whose markup is literal text (only charrefs decoded); newer
+# html.parser versions handle these themselves
+RCDATA_TAGS = frozenset(["textarea", "title"])
+NATIVE_RCDATA = hasattr(HTMLParser, "RCDATA_CONTENT_ELEMENTS")
+FEED_CHUNK = 64 * 1024  # characters fed to the streaming parser at a time
+
+
+class _TextExtractor(HTMLParser):
+    """Collects visible text while streaming, never building a tree.
+
+    Text inside SKIP_TAGS is dropped as it arrives. Open elements are kept on
+    a stack so an end tag also closes whatever it implicitly encloses (e.g.
+    an unclosed <nav> inside a <div>), as a tree builder would. Each run of
+    text between two tags is whitespace-normalised and kept as one piece,
+    mirroring the strings BeautifulSoup's get_text(separator=' ', strip=True)
+    would join. <textarea> and <title> content is taken literally, markup
+    included, and a CDATA section separates the text around it, as lxml does.
+    """
+
+    def __init__(self, max_chars=None):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.parts = []
+        self.length = 0
+        self.skip_depth = 0
+        self.open_tags = []
+        self._rcdata = False
+        self.done = False
+        self._pending = []
+        self._pending_len = 0
+
+    def _flush(self):
+        if not self._pending:
+            return
+        text = ' '.join(''.join(self._pending).split())
+        self._pending = []
+        self._pending_len = 0
+        if text:
+            self.parts.append(text)
+            self.length += len(text) + 1
+            if self.max_chars and self.length >= self.max_chars:
+                self.done = True
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in VOID_TAGS:
+            return
+        self.open_tags.append(tag)
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        if tag in RCDATA_TAGS and not NATIVE_RCDATA:
+            self.set_cdata_mode(tag)
+            self._rcdata = True
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush()
+
+    def handle_endtag(self, tag):
+        if tag not in self.open_tags:
+            return  # stray end tag: tree builders drop it and keep the text run whole
+        self._flush()
+        self._rcdata = False
+        while True:
+            closed = self.open_tags.pop()
+            if closed in SKIP_TAGS:
+                self.skip_depth -= 1
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        if self.skip_depth or self.done:
+            return
+        if self._rcdata:
+            data = unescape(data)  # cdata mode passes character references through raw
+        self._pending.append(data)
+        self._pending_len += len(data)
+        if self.max_chars and self._pending_len > self.max_chars:
+            # One very long text run: stop as soon as it alone fills the budget,
+            # otherwise collapse its whitespace now so it can't grow unbounded
+            raw = ''.join(self._pending)
+            text = ' '.join(raw.split())
+            if self.length + len(text) >= self.max_chars:
+                self._flush()
+            else:
+                lead = ' ' if raw[:1].isspace() else ''
+                trail = ' ' if raw[-1:].isspace() else ''
+                self._pending = [lead + text + trail]
+                self._pending_len = len(self._pending[0])
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()  # <![CDATA[...]]>: dropped, but still splits the text around it
+
+    def close(self):
+        if self._rcdata and self.rawdata:
+            # An unclosed <textarea> runs to the end of the document
+            self.handle_data(self.rawdata)
+            self.rawdata = ''
+        super().close()
+
+    def text(self):
+        self._flush()
+        text = ' '.join(self.parts)
+        return text[:self.max_chars] if self.max_chars else text
+
+
+def parse_html_stream(html, max_chars=None):
+    """Extract visible text in one streaming pass, stopping once max_chars are collected"""
+    extractor = _TextExtractor(max_chars=max_chars)
+    for i in range(0, len(html), FEED_CHUNK):
+        extractor.feed(html[i:i + FEED_CHUNK])
+        if extractor.done:
+            break
+    else:
+        extractor.close()
+    return extractor.text()
+
+
+def parse_html_soup(html):
+    """Tree-based extraction with BeautifulSoup (fallback for parse_html)"""
     try:
         soup = BeautifulSoup(html, 'lxml')
     except Exception:
@@ -15,28 +148,160 @@ def parse_html(html):
     return text
 
 
+def parse_html(html, max_chars=None):
+    try:
+        return parse_html_stream(html, max_chars=max_chars)
+    except Exception:
+        text = parse_html_soup(html)
+        return text[:max_chars] if max_chars else text
+
+
+SNIPPET_WINDOW = 20  # words per snippet window
+
+
+@lru_cache(maxsize=256)
+def _highlighter(query_words):
+    """One compiled alternation for all query words, longest first so 'news' wins over 'new'"""
+    ordered = sorted(set(query_words), key=len, reverse=True)
+    return re.compile('(' + '|'.join(map(re.escape, ordered)) + ')', re.IGNORECASE)
+
+
+def _window_scores(lowered, query_words, window):
+    """(start, score) for every window start where the score can change, in order.
+
+    A window's score is the number of query words (with repeats) that occur
+    as a substring of some token in it. Only tokens containing a query word
+    matter: each one enters the window at start p-window+1 and leaves at
+    p+1, so a sweep over those events with incremental per-word counts
+    scores every distinct window in one pass.
+    """
+    weights = {}
+    for w in query_words:
+        weights[w] = weights.get(w, 0) + 1
+
+    # Query words contained in each distinct token, then positions of matching tokens
+    matching = {}
+    for token in set(lowered):
+        hits = tuple(q for q in weights if q in token)
+        if hits:
+            matching[token] = hits
+    events = []
+    for p, token in enumerate(lowered):
+        hits = matching.get(token)
+        if hits:
+            events.append((max(0, p - window + 1), 1, hits))
+            events.append((p + 1, -1, hits))
+    events.sort(key=lambda e: e[0])
+
+    counts = dict.fromkeys(weights, 0)
+    score = 0
+    candidates = [(0, 0)]
+    n = len(lowered)
+    i = 0
+    while i < len(events):
+        start = events[i][0]
+        while i < len(events) and events[i][0] == start:
+            _, delta, hits = events[i]
+            for q in hits:
+                before = counts[q]
+                counts[q] += delta
+                if before == 0 and delta > 0:
+                    score += weights[q]
+                elif counts[q] == 0:
+                    score -= weights[q]
+            i += 1
+        if start >= n:
+            break
+        if start == 0:
+            candidates[0] = (0, score)
+        else:
+            candidates.append((start, score))
+    return candidates
+
+
+def _format_snippet(words, start, query_words, max_length, window):
+    snippet = ' '.join(words[start:start + window])
+    snippet = snippet[:max_length]
+    
+    # Highlight query words
+    snippet = _highlighter(tuple(query_words)).sub(r'**\1**', snippet)
+    
+    return snippet + ('...' if len(snippet) >= max_length else '')
+
+
+def extract_snippets(text, query, k=3, max_length=300, window=SNIPPET_WINDOW):
+    """Up to k non-overlapping snippets, best window first"""
+    query_words = [w.lower() for w in re.findall(r'\w+', query)]
+    if not query_words:
+        return [text[:max_length]]
+    
+    words = text.split()
+    if not words:
+        return ['']
+    candidates = _window_scores(text.lower().split(), query_words, window)
+    
+    if k == 1:
+        # Earliest best window, as the original scan picked it
+        start, score = max(candidates, key=lambda c: (c[1], -c[0]))
+        starts = [start if score > 0 else 0]
+    else:
+        starts = []
+        for start, score in sorted(candidates, key=lambda c: (-c[1], c[0])):
+            if len(starts) >= k or score <= 0:
+                break
+            if all(abs(start - s) >= window for s in starts):
+                starts.append(start)
+        starts = starts or [0]
+    return [_format_snippet(words, s, query_words, max_length, window) for s in starts]
+
+
 def extract_snippet(text, query, max_length=300):
+    return extract_snippets(text, query, k=1, max_length=max_length)[0]
+
+
+# ---------------- BENCHMARK ----------------
+def _extract_snippet_naive(text, query, max_length=300):
+    """Previous O(n * window * q) implementation, kept for the benchmark"""
     query_words = [w.lower() for w in re.findall(r'\w+', query)]
     if not query_words:
         return text[:max_length]
-    
-    # Find best window with most query words
     words = text.split()
     best_score = 0
     best_start = 0
-    
     for i in range(len(words)):
         window = ' '.join(words[i:i+20]).lower()
         score = sum(1 for w in query_words if w in window)
         if score > best_score:
             best_score = score
             best_start = i
-    
     snippet = ' '.join(words[best_start:best_start+20])
     snippet = snippet[:max_length]
-    
-    # Highlight query words
     for word in query_words:
         snippet = re.sub(f'({word})', r'**\1**', snippet, flags=re.IGNORECASE)
-    
-    return snippet + ('...' if len(snippet) >= max_length else '')
\ No newline at end of file
+    return snippet + ('...' if len(snippet) >= max_length else '')
+
+
+def _benchmark(page_kb=200, repeat=3):
+    import random
+    import time
+    rng = random.Random(0)
+    vocab = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 9)))
+             for _ in range(5000)]
+    words = []
+    while sum(map(len, words)) + len(words) < page_kb * 1024:
+        words.append(rng.choice(vocab))
+    text = ' '.join(words)
+    query = ' '.join(rng.sample(vocab, 3)) + ' price today'
+    print(f"Page: {len(text) / 1024:.0f} KB, {len(words)} words, query: {query!r}")
+    for name, fn in (("naive", _extract_snippet_naive), ("sliding", extract_snippet)):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn(text, query)
+        print(f"  {name:8s} {(time.perf_counter() - started) / repeat * 1000:8.1f} ms/query")
+    started = time.perf_counter()
+    extract_snippets(text, query, k=5)
+    print(f"  top-5    {(time.perf_counter() - started) * 1000:8.1f} ms/query")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,52 @@
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+logger = logging.getLogger('Politeness')
+
+
+def host_of(url):
+    return urlsplit(url).netloc.lower()
+
+
+class HostRateLimiter:
+    """Per-host concurrency cap plus a minimum delay between request starts.
+
+    Usage:
+        with limiter.slot(url):
+            fetch(url)
+    """
+
+    def __init__(self, min_interval=1.0, per_host=1):
+        self.min_interval = min_interval
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_allowed = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+    def _reserve(self, host):
+        """Book the next start time for host and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = start + self.min_interval
+            return start - now
+
+    @contextmanager
+    def slot(self, url):
+        host = host_of(url)
+        sem = self._semaphore(host)
+        with sem:
+            delay = self._reserve(host)
+            if delay > 0:
+                time.sleep(delay)
+            yield
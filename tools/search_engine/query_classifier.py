@@ -4,4 +4,78 @@ def classify_query(query, seed_websites):
         keywords = [k.strip().lower() for k in site['keywords'].split(',')]
         if any(keyword and keyword in query for keyword in keywords):
             return site['category']
-    return "General"
\ No newline at end of file
+    return "General"
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over every seed keyword.
+
+    Each keyword maps to a rank (the index of the first site listing it);
+    best_rank() scans the query once and returns the lowest rank of any
+    keyword occurring in it, so the result matches classify_query's
+    first-site-wins order no matter how many keywords there are.
+    """
+
+    def __init__(self, ranked_keywords):
+        self.goto = [{}]
+        self.fail = [0]
+        self.rank = [None]
+        for keyword, rank in ranked_keywords.items():
+            self._add(keyword, rank)
+        self._link()
+
+    def _add(self, keyword, rank):
+        node = 0
+        for ch in keyword:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.rank.append(None)
+            node = nxt
+        if self.rank[node] is None or rank < self.rank[node]:
+            self.rank[node] = rank
+
+    def _link(self):
+        # Breadth-first so every fail target is finished before it is used
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for ch, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                # Fold in ranks of keywords that end inside this one
+                inherited = self.rank[self.fail[child]]
+                if inherited is not None and (self.rank[child] is None or inherited < self.rank[child]):
+                    self.rank[child] = inherited
+                queue.append(child)
+
+    def best_rank(self, text):
+        best = None
+        node = 0
+        goto, fail, rank = self.goto, self.fail, self.rank
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            r = rank[node]
+            if r is not None and (best is None or r < best):
+                best = r
+                if best == 0:
+                    break
+        return best
+
+
+def build_matcher(seed_websites):
+    """KeywordMatcher over all sites' comma-separated keywords"""
+    ranked = {}
+    for idx, site in enumerate(seed_websites):
+        for keyword in site['keywords'].split(','):
+            keyword = keyword.strip().lower()
+            if keyword and keyword not in ranked:
+                ranked[keyword] = idx
+    return KeywordMatcher(ranked)
@@ -0,0 +1,224 @@
+import os
+import time
+import heapq
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from . import crawler, search_index, seed_loader
+from .frontier import Frontier, extract_links
+from .politeness import HostRateLimiter
+from .simhash import simhash
+
+logger = logging.getLogger('RecrawlScheduler')
+
+MIN_INTERVAL = 10 * 60  # never recrawl a site more often than this
+MAX_INTERVAL = 4 * 3600  # stay under mini_integration.INDEX_MAX_AGE so hits remain fresh
+DEFAULT_INTERVAL = 3600
+BACKOFF = 1.5  # interval multiplier when content is unchanged
+SPEEDUP = 0.5  # interval multiplier when content changed
+# Link following from each seed; depth 0 keeps the old seed-only behaviour.
+# Seed CSV columns follow_depth / follow_pages override these per site.
+FOLLOW_DEPTH = int(os.getenv("MINI_FOLLOW_DEPTH", "0"))
+FOLLOW_PAGES = int(os.getenv("MINI_FOLLOW_PAGES", "20"))
+FRONTIER_MEMORY_CAP = int(os.getenv("MINI_FRONTIER_MEMORY_CAP", "500"))
+
+
+class RecrawlScheduler:
+    """Keeps search_index warm by recrawling seed sites when they fall due.
+
+    Sites sit in a min-heap ordered by next-due time. Each crawl hashes the
+    parsed text: a change halves the site's interval, no change (or only a
+    near-duplicate by SimHash) stretches it, so busy sites are visited
+    often and static ones rarely. Global
+    concurrency is capped by the worker pool, per-host load by a
+    HostRateLimiter. State survives restarts in search_index.crawl_state.
+    When a seed changes and link following is enabled, a Frontier walks
+    same-host links from it within the depth and page budget.
+    """
+
+    def __init__(self, registry, db_path=search_index.DB_PATH, max_concurrency=4,
+                 per_host_interval=2.0, fingerprints=None, vectors=None):
+        self.registry = registry
+        self.fingerprints = fingerprints
+        self.vectors = vectors
+        self.db_path = db_path
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="recrawl")
+        self._limiter = HostRateLimiter(min_interval=per_host_interval)
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = 0
+        self._states = {}
+        self._sites = {}
+        self._inflight = set()
+        self._sites_version = None
+        self._running = False
+        self._thread = None
+
+    # ---------------- QUEUE ----------------
+    def _push(self, url, due):
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, url))
+
+    def _sync_sites(self):
+        """Pick up added/removed seed sites after a registry reload"""
+        self.registry.reload_if_changed()
+        if self.registry.sites is self._sites_version:
+            return
+        self._sites_version = self.registry.sites
+        sites = {site['website_url']: site for site in self.registry.sites}
+        now = time.time()
+        with self._cond:
+            for url, site in sites.items():
+                if url in self._sites:
+                    continue
+                state = self._states.get(url)
+                if state is None:
+                    interval = seed_loader.max_age_seconds(site, DEFAULT_INTERVAL)
+                    state = {'interval': min(MAX_INTERVAL, max(MIN_INTERVAL, interval)), 'next_due': now}
+                    self._states[url] = state
+                self._push(url, state['next_due'])
+            self._sites = sites  # heap entries for removed sites are dropped when popped
+            self._cond.notify()
+
+    # ---------------- CRAWL ----------------
+    def _crawl(self, url):
+        site = self._sites.get(url)
+        state = self._states[url]
+        try:
+            if site is not None:
+                self._crawl_site(site, state)
+        except Exception as e:
+            logger.error(f"Recrawl of {url} failed: {e}")
+        finally:
+            state['next_due'] = time.time() + state['interval']
+            search_index.save_crawl_state(self.db_path, url, state)
+            with self._cond:
+                self._inflight.discard(url)
+                if url in self._sites:
+                    self._push(url, state['next_due'])
+                self._cond.notify()
+
+    def _crawl_site(self, site, state):
+        url = site['website_url']
+        with self._limiter.slot(url):
+            # max_age=0 forces revalidation; a 304 still comes back from the page cache
+            page = crawler.fetch_page(url, use_js=(site['type'] == 'JS'), max_age=0)
+        if not page:
+            return
+        content_hash = hashlib.sha1(page.text.encode('utf-8')).hexdigest()
+        changed = content_hash != state.get('content_hash')
+        state['checks'] = state.get('checks', 0) + 1
+        state['last_crawled'] = time.time()
+
+        duplicate = None
+        if changed and self.fingerprints is not None:
+            # Timestamp/ad-slot churn or a mirrored story counts as no real change
+            fp = simhash(page.text)
+            duplicate = self.fingerprints.check(url, fp)
+            if duplicate is None:
+                self._remember(url, fp)
+        state['content_hash'] = content_hash
+
+        if changed and duplicate is None:
+            state['changes'] = state.get('changes', 0) + 1
+            state['interval'] = max(MIN_INTERVAL, state['interval'] * SPEEDUP)
+            self._index(site, url, page)
+            logger.info(f"Reindexed {url}; next check in {state['interval'] / 60:.0f} min")
+            self._follow_links(site, page)
+        else:
+            state['interval'] = min(MAX_INTERVAL, state['interval'] * BACKOFF)
+            if not changed or duplicate == 'unchanged':
+                if search_index.touch_page(self.db_path, url) == 0:
+                    # Compacted away or never stored: put it back
+                    self._index(site, url, page)
+                    if self.fingerprints is not None:
+                        self._remember(url, simhash(page.text))
+
+    def _follow_links(self, site, seed_page):
+        """Index pages linked from a changed seed, breadth-first within its budget"""
+        max_depth, max_pages = seed_loader.follow_settings(site, FOLLOW_DEPTH, FOLLOW_PAGES)
+        if max_depth <= 0 or max_pages <= 0:
+            return
+        seed_url = site['website_url']
+        indexed = 0
+        # +1: the seed itself is popped first but does not count against the budget
+        with Frontier(seed_url, max_depth=max_depth, max_pages=max_pages + 1,
+                      memory_cap=FRONTIER_MEMORY_CAP) as frontier:
+            while self._running:
+                item = frontier.pop()
+                if item is None:
+                    break
+                url, depth = item
+                if depth == 0:
+                    page = seed_page  # already fetched and indexed
+                else:
+                    with self._limiter.slot(url):
+                        page = crawler.fetch_page(url)
+                    if not page:
+                        continue
+                    if self._index_linked(site, url, page):
+                        indexed += 1
+                if depth < max_depth and page.html:
+                    frontier.add_links(extract_links(page.html, url), depth)
+        if indexed:
+            logger.info(f"Indexed {indexed} linked pages from {seed_url}")
+
+    def _index_linked(self, site, url, page):
+        if self.fingerprints is not None:
+            fp = simhash(page.text)
+            duplicate = self.fingerprints.check(url, fp)
+            if duplicate == 'unchanged':
+                if search_index.touch_page(self.db_path, url) != 0:
+                    return False
+            elif duplicate is not None:
+                return False
+            self._remember(url, fp)
+        self._index(site, url, page)
+        return True
+
+    def _remember(self, url, fp):
+        self.fingerprints.add(url, fp)
+        search_index.save_fingerprint(self.db_path, url, fp)
+
+    def _index(self, site, url, page):
+        search_index.index_page(self.db_path, url, site['category'], page.text, site['keywords'])
+        if self.vectors is not None:
+            self.vectors.add_page(url, page.text, site['category'])
+
+    # ---------------- MAIN LOOP ----------------
+    def _loop(self):
+        while self._running:
+            self._sync_sites()
+            search_index.maybe_compact(self.db_path, background=True)  # throttled to COMPACT_INTERVAL
+            with self._cond:
+                now = time.time()
+                while (self._heap and self._heap[0][0] <= now
+                       and len(self._inflight) < self.max_concurrency):
+                    _, _, url = heapq.heappop(self._heap)
+                    if url not in self._sites or url in self._inflight:
+                        continue
+                    self._inflight.add(url)
+                    self._executor.submit(self._crawl, url)
+                if self._heap and len(self._inflight) < self.max_concurrency:
+                    wait = max(0.0, self._heap[0][0] - now)
+                else:
+                    wait = None
+                # Wake up when the next site is due, a crawl finishes, or to re-check the CSV
+                self._cond.wait(timeout=min(wait, 60.0) if wait is not None else 60.0)
+
+    def start(self):
+        if self._running:
+            return
+        self._states = search_index.load_crawl_states(self.db_path)
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="recrawl-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Background recrawl scheduler started")
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._executor.shutdown(wait=False)
@@ -1,32 +1,355 @@
+import os
+import re
+import time
 import sqlite3
-from datetime import datetime
+import threading
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger('SearchIndex')
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "search_db.sqlite")
+RETENTION_DAYS = int(os.getenv("MINI_INDEX_RETENTION_DAYS", "30"))
+COMPACT_INTERVAL = 24 * 3600  # seconds between automatic compactions
+
+# One long-lived connection per database file, shared by all threads under a lock
+_connections = {}
+_locks = {}
+_initialized = set()
+_registry_lock = threading.Lock()
+_compact_listeners = []
+_compacting = set()
+
+def _get_connection(db_path):
+    """Return (connection, lock) for db_path, opening it in WAL mode on first use"""
+    with _registry_lock:
+        conn = _connections.get(db_path)
+        if conn is None:
+            conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            # Must come before journal_mode=WAL, which writes the header of a new file;
+            # existing files keep their mode until compact() runs a full VACUUM
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            _connections[db_path] = conn
+            _locks[db_path] = threading.RLock()
+        return conn, _locks[db_path]
+
+def close_all():
+    """Close every cached connection (tests, shutdown)"""
+    with _registry_lock:
+        for conn in _connections.values():
+            conn.close()
+        _connections.clear()
+        _locks.clear()
+        _initialized.clear()
 
 def init_db(db_path='search_db.sqlite'):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS results (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            url TEXT NOT NULL,
-            category TEXT NOT NULL,
-            snippet TEXT NOT NULL,
-            keywords TEXT NOT NULL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    """Create tables and indexes once per process; later calls are free"""
+    if db_path in _initialized:
+        return
+    conn, lock = _get_connection(db_path)
+    with lock:
+        if db_path in _initialized:
+            return
+        conn.execute('BEGIN')
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    snippet TEXT NOT NULL,
+                    keywords TEXT NOT NULL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # Older databases appended a row per crawl; keep only the newest per (url, category)
+            conn.execute('''
+                DELETE FROM results WHERE id NOT IN (
+                    SELECT MAX(id) FROM results GROUP BY url, category
+                )
+            ''')
+            conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_results_url_category ON results (url, category)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_results_category ON results (category)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_results_timestamp ON results (timestamp)')
+            # Full-text index: one row per page, BM25-ranked over page text + snippets
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS pages (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL UNIQUE,
+                    category TEXT NOT NULL,
+                    keywords TEXT NOT NULL DEFAULT '',
+                    indexed_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+                    content, snippet, tokenize = 'unicode61 remove_diacritics 2'
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_category ON pages (category, indexed_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_indexed_at ON pages (indexed_at)')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            # Per-URL recrawl bookkeeping for the background scheduler
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS crawl_state (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT,
+                    interval REAL NOT NULL,
+                    next_due REAL NOT NULL,
+                    last_crawled REAL,
+                    checks INTEGER NOT NULL DEFAULT 0,
+                    changes INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID
+            ''')
+            # 64-bit SimHash per crawled URL, for near-duplicate detection
+            conn.execute('CREATE TABLE IF NOT EXISTS fingerprints (url TEXT PRIMARY KEY, simhash INTEGER NOT NULL) WITHOUT ROWID')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        _initialized.add(db_path)
+    maybe_compact(db_path)
+
+# ---------------- WRITES ----------------
+def _to_signed(fp):
+    return fp - (1 << 64) if fp >= 1 << 63 else fp  # SQLite integers are signed 64-bit
+
+def _upsert_result(conn, url, category, snippet, keywords):
+    conn.execute('''
+        INSERT INTO results (url, category, snippet, keywords, timestamp)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (url, category) DO UPDATE SET
+            snippet = excluded.snippet,
+            keywords = excluded.keywords,
+            timestamp = excluded.timestamp
+    ''', (url, category, snippet, keywords, datetime.now().isoformat(sep=' ')))
+
+def _index_page(conn, url, category, text, keywords, snippet):
+    row = conn.execute('SELECT id FROM pages WHERE url = ?', (url,)).fetchone()
+    if row:
+        page_id = row[0]
+        conn.execute('UPDATE pages SET category = ?, keywords = ?, indexed_at = ? WHERE id = ?',
+                     (category, keywords, time.time(), page_id))
+        conn.execute('DELETE FROM pages_fts WHERE rowid = ?', (page_id,))
+    else:
+        page_id = conn.execute('INSERT INTO pages (url, category, keywords, indexed_at) VALUES (?, ?, ?, ?)',
+                               (url, category, keywords, time.time())).lastrowid
+    conn.execute('INSERT INTO pages_fts (rowid, content, snippet) VALUES (?, ?, ?)',
+                 (page_id, text, snippet))
+
+def _write(db_path, fn):
+    """Run fn(conn) inside one transaction on the shared connection; returns fn's result (None on error)"""
+    init_db(db_path)
+    conn, lock = _get_connection(db_path)
+    with lock:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(conn)
+            conn.execute('COMMIT')
+            return result
+        except Exception as e:
+            conn.execute('ROLLBACK')
+            logger.error(f"Database error: {str(e)}")
 
 def store_result(db_path, url, category, snippet, keywords):
+    _write(db_path, lambda conn: _upsert_result(conn, url, category, snippet, keywords))
+
+def index_page(db_path, url, category, text, keywords='', snippet=''):
+    """Add or replace a page's parsed text (and latest snippet) in the full-text index"""
+    _write(db_path, lambda conn: _index_page(conn, url, category, text, keywords, snippet))
+
+def store_batch(db_path, results, touched=()):
+    """Upsert a whole crawl in one transaction.
+
+    Each result is a dict with url, category, snippet, keywords and,
+    optionally, the page text to add to the full-text index and its
+    SimHash. URLs in touched only have their index timestamp refreshed.
+    Returns True once the transaction has committed.
+    """
+    if not results and not touched:
+        return True
+    def write(conn):
+        for r in results:
+            _upsert_result(conn, r['url'], r['category'], r['snippet'], r.get('keywords', ''))
+            if r.get('text') is not None:
+                _index_page(conn, r['url'], r['category'], r['text'], r.get('keywords', ''), r['snippet'])
+            if r.get('simhash') is not None:
+                conn.execute('INSERT OR REPLACE INTO fingerprints VALUES (?, ?)',
+                             (r['url'], _to_signed(r['simhash'])))
+        now = time.time()
+        conn.executemany('UPDATE pages SET indexed_at = ? WHERE url = ?', [(now, url) for url in touched])
+        return True
+    stored = bool(_write(db_path, write))
+    maybe_compact(db_path, background=True)
+    return stored
+
+def touch_page(db_path, url):
+    """Mark an indexed page as re-verified without rewriting its text.
+    Returns the number of rows updated: 0 means the page is not indexed (any more)."""
+    return _write(db_path, lambda conn: conn.execute('UPDATE pages SET indexed_at = ? WHERE url = ?',
+                                                     (time.time(), url)).rowcount)
+
+def has_page(db_path, url):
+    """True if url has a row in the full-text index"""
+    init_db(db_path)
+    conn, lock = _get_connection(db_path)
+    with lock:
+        return conn.execute('SELECT 1 FROM pages WHERE url = ?', (url,)).fetchone() is not None
+
+# ---------------- CRAWL STATE ----------------
+def load_crawl_states(db_path=DB_PATH):
+    """{url: {content_hash, interval, next_due, last_crawled, checks, changes}}"""
+    init_db(db_path)
+    conn, lock = _get_connection(db_path)
+    with lock:
+        rows = conn.execute('SELECT url, content_hash, interval, next_due, last_crawled, checks, changes '
+                            'FROM crawl_state').fetchall()
+    keys = ('content_hash', 'interval', 'next_due', 'last_crawled', 'checks', 'changes')
+    return {row[0]: dict(zip(keys, row[1:])) for row in rows}
+
+def save_crawl_state(db_path, url, state):
+    _write(db_path, lambda conn: conn.execute(
+        'INSERT OR REPLACE INTO crawl_state VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (url, state.get('content_hash'), state['interval'], state['next_due'],
+         state.get('last_crawled'), state.get('checks', 0), state.get('changes', 0))
+    ))
+
+# ---------------- FINGERPRINTS ----------------
+def load_fingerprints(db_path=DB_PATH):
+    init_db(db_path)
+    conn, lock = _get_connection(db_path)
+    with lock:
+        rows = conn.execute('SELECT url, simhash FROM fingerprints').fetchall()
+    return {url: fp & ((1 << 64) - 1) for url, fp in rows}
+
+def save_fingerprint(db_path, url, fp):
+    _write(db_path, lambda conn: conn.execute('INSERT OR REPLACE INTO fingerprints VALUES (?, ?)',
+                                              (url, _to_signed(fp))))
+
+# ---------------- SEARCH ----------------
+def _match_expression(query):
+    """FTS5 MATCH string: any query term, each quoted so punctuation can't break the syntax"""
+    terms = [t for t in re.findall(r'\w+', query.lower()) if len(t) > 1]
+    return ' OR '.join(f'"{t}"' for t in dict.fromkeys(terms))
+
+def search(query, category=None, k=5, max_age=None, db_path=DB_PATH, urls=None):
+    """BM25-ranked pages matching query.
+
+    category limits results to one seed category; max_age (seconds) drops
+    pages indexed longer ago than that; urls restricts the search to those
+    pages. Returns dicts shaped like crawl results.
+    """
+    match = _match_expression(query)
+    if not match:
+        return []
+    sql = '''
+        SELECT p.url, p.category, p.indexed_at,
+               snippet(pages_fts, 0, '**', '**', '...', 24),
+               bm25(pages_fts, 1.0, 2.0) AS score
+        FROM pages_fts JOIN pages p ON p.id = pages_fts.rowid
+        WHERE pages_fts MATCH ?
+    '''
+    params = [match]
+    if category:
+        sql += ' AND p.category = ?'
+        params.append(category)
+    if max_age is not None:
+        sql += ' AND p.indexed_at >= ?'
+        params.append(time.time() - max_age)
+    if urls is not None:
+        urls = list(urls)
+        if not urls:
+            return []
+        sql += f' AND p.url IN ({",".join("?" * len(urls))})'
+        params.extend(urls)
+    sql += ' ORDER BY score LIMIT ?'
+    params.append(k)
+
+    init_db(db_path)
+    conn, lock = _get_connection(db_path)
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO results (url, category, snippet, keywords, timestamp)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (url, category, snippet, keywords, datetime.now()))
-        conn.commit()
+        with lock:
+            rows = conn.execute(sql, params).fetchall()
     except Exception as e:
-        print(f"Database error: {str(e)}")
-    finally:
-        conn.close()
\ No newline at end of file
+        logger.error(f"Database error: {str(e)}")
+        return []
+    return [{
+        "url": url,
+        "snippet": snippet,
+        "category": cat,
+        "score": -score,  # bm25() is lower-is-better; flip so higher means more relevant
+        "indexed_at": indexed_at,
+        "source": "index"
+    } for url, cat, indexed_at, snippet, score in rows]
+
+# ---------------- RETENTION ----------------
+def on_compact(callback):
+    """Call callback(removed_urls) after every compaction, e.g. to prune caches kept beside the index"""
+    if callback not in _compact_listeners:
+        _compact_listeners.append(callback)
+
+def compact(db_path=DB_PATH, retention_days=RETENTION_DAYS):
+    """Drop rows older than retention_days, merge FTS segments and give space back to the OS"""
+    init_db(db_path)
+    conn, lock = _get_connection(db_path)
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    with lock:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            removed = conn.execute('DELETE FROM results WHERE timestamp < ?',
+                                   (cutoff.isoformat(sep=' '),)).rowcount
+            stale = conn.execute('SELECT id, url FROM pages WHERE indexed_at < ?',
+                                 (cutoff.timestamp(),)).fetchall()
+            conn.executemany('DELETE FROM pages_fts WHERE rowid = ?', [(i,) for i, _ in stale])
+            conn.executemany('DELETE FROM pages WHERE id = ?', [(i,) for i, _ in stale])
+            conn.executemany('DELETE FROM fingerprints WHERE url = ?', [(url,) for _, url in stale])
+            conn.execute("INSERT INTO pages_fts (pages_fts) VALUES ('optimize')")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_compacted', ?)", (str(time.time()),))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+            conn.execute('PRAGMA incremental_vacuum')
+        else:
+            # Databases created before auto_vacuum was enabled need one full VACUUM to switch
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.execute('VACUUM')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    logger.info(f"Compacted {db_path}: {removed} results and {len(stale)} pages older than {retention_days} days")
+    for callback in list(_compact_listeners):
+        try:
+            callback([url for _, url in stale])
+        except Exception as e:
+            logger.error(f"Compaction listener failed: {e}")
+
+def maybe_compact(db_path=DB_PATH, background=False):
+    """Run compact() if it hasn't run in the last COMPACT_INTERVAL seconds.
+
+    Cheap enough to call after every crawl; background=True leaves the
+    VACUUM to its own thread. At most one compaction per database runs at a time.
+    """
+    conn, lock = _get_connection(db_path)
+    with lock:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_compacted'").fetchone()
+        if row is None:
+            # Fresh database: nothing to compact yet, just start the clock
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_compacted', ?)", (str(time.time()),))
+            return
+        if time.time() - float(row[0]) < COMPACT_INTERVAL or db_path in _compacting:
+            return
+        _compacting.add(db_path)
+    def run():
+        try:
+            compact(db_path)
+        except Exception as e:
+            logger.error(f"Compaction failed: {e}")
+        finally:
+            with lock:
+                _compacting.discard(db_path)
+    if background:
+        threading.Thread(target=run, name="index-compact", daemon=True).start()
+    else:
+        run()
@@ -1,5 +1,8 @@
+import os
 import csv
+import threading
 import logging
+from .query_classifier import build_matcher
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('SeedLoader')
@@ -17,4 +20,85 @@ def load_seed_websites(csv_path):
         logger.info(f"Successfully loaded {len(websites)} websites")
     except Exception as e:
         logger.error(f"Failed to load seed websites: {e}")
-    return websites
\ No newline at end of file
+    return websites
+
+def max_age_seconds(site, default):
+    """Per-site freshness from the optional 'refresh_minutes' CSV column"""
+    value = (site.get('refresh_minutes') or '').strip()
+    try:
+        return float(value) * 60 if value else default
+    except ValueError:
+        logger.warning(f"Invalid refresh_minutes '{value}' for {site.get('website_url')}")
+        return default
+
+def follow_settings(site, depth, pages):
+    """(max_depth, max_pages) for link following, from optional 'follow_depth'/'follow_pages' columns"""
+    result = []
+    for column, default in (('follow_depth', depth), ('follow_pages', pages)):
+        value = (site.get(column) or '').strip()
+        try:
+            result.append(int(value) if value else default)
+        except ValueError:
+            logger.warning(f"Invalid {column} '{value}' for {site.get('website_url')}")
+            result.append(default)
+    return tuple(result)
+
+class SeedRegistry:
+    """Seed websites loaded once, indexed by category, reloaded when the CSV changes"""
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+        self.sites = []
+        self.by_category = {}
+        self.matcher = build_matcher([])
+        self._stamp = None
+        self._lock = threading.Lock()
+        self.reload_if_changed()
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.csv_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def reload_if_changed(self):
+        """Rebuild from the CSV if its mtime/size changed. Returns True if reloaded."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        with self._lock:
+            if stamp == self._stamp:
+                return False
+            sites = load_seed_websites(self.csv_path)
+            by_category = {}
+            for site in sites:
+                by_category.setdefault(site['category'], []).append(site)
+            matcher = build_matcher(sites)
+            # Swap everything in together so readers never see a half-built registry
+            self.sites, self.by_category, self.matcher = sites, by_category, matcher
+            self._stamp = stamp
+        return True
+
+    def sites_for(self, category):
+        self.reload_if_changed()
+        return self.by_category.get(category, [])
+
+    def classify(self, query):
+        """Category of the first site with a keyword in query, or 'General'"""
+        self.reload_if_changed()
+        sites, matcher = self.sites, self.matcher
+        rank = matcher.best_rank(query.lower())
+        if rank is None or rank >= len(sites):
+            return "General"
+        return sites[rank]['category']
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+def get_registry(csv_path):
+    """Shared SeedRegistry for csv_path"""
+    with _registries_lock:
+        registry = _registries.get(csv_path)
+        if registry is None:
+            registry = _registries[csv_path] = SeedRegistry(csv_path)
+        return registry
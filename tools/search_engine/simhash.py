@@ -0,0 +1,117 @@
+import re
+import hashlib
+import threading
+from collections import Counter
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+BITS = 64
+BANDS = 4  # 4 x 16-bit bands: any pair within 3 bits shares at least one band exactly
+BAND_BITS = BITS // BANDS
+MAX_DISTANCE = 3
+
+
+def _features(text, shingle=3):
+    """Weighted word shingles of the text"""
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < shingle:
+        return Counter([' '.join(words)]) if words else Counter()
+    return Counter(' '.join(words[i:i + shingle]) for i in range(len(words) - shingle + 1))
+
+
+def _hash64(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text):
+    """64-bit SimHash fingerprint of text; similar texts differ in few bits"""
+    features = _features(text)
+    if not features:
+        return 0
+    hashes = [_hash64(f) for f in features]
+    weights = list(features.values())
+    if HAS_NUMPY:
+        h = np.array(hashes, dtype=np.uint64)
+        bits = ((h[:, None] >> np.arange(BITS, dtype=np.uint64)) & np.uint64(1)).astype(np.int64)
+        totals = (2 * bits - 1).T @ np.array(weights, dtype=np.int64)
+        positive = np.nonzero(totals > 0)[0]
+        return sum(1 << int(b) for b in positive)
+    totals = [0] * BITS
+    for value, weight in zip(hashes, weights):
+        for b in range(BITS):
+            totals[b] += weight if value >> b & 1 else -weight
+    return sum(1 << b for b in range(BITS) if totals[b] > 0)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def _bands(fp):
+    mask = (1 << BAND_BITS) - 1
+    return [(i, (fp >> (i * BAND_BITS)) & mask) for i in range(BANDS)]
+
+
+class SimHashIndex:
+    """Fingerprint per key with banded lookup for Hamming-distance queries"""
+
+    def __init__(self, fingerprints=None, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._by_key = {}
+        self._tables = [dict() for _ in range(BANDS)]
+        for key, fp in (fingerprints or {}).items():
+            self._add(key, fp)
+
+    def _add(self, key, fp):
+        self._remove(key)
+        self._by_key[key] = fp
+        for i, band in _bands(fp):
+            self._tables[i].setdefault(band, set()).add(key)
+
+    def _remove(self, key):
+        fp = self._by_key.pop(key, None)
+        if fp is None:
+            return
+        for i, band in _bands(fp):
+            bucket = self._tables[i].get(band)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._tables[i][band]
+
+    def add(self, key, fp):
+        with self._lock:
+            self._add(key, fp)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def get(self, key):
+        return self._by_key.get(key)
+
+    def near(self, fp, max_distance=None):
+        """[(key, distance)] for every stored fingerprint within max_distance bits"""
+        max_distance = self.max_distance if max_distance is None else max_distance
+        with self._lock:
+            candidates = set()
+            for i, band in _bands(fp):
+                candidates |= self._tables[i].get(band, set())
+            found = [(key, hamming(fp, self._by_key[key])) for key in candidates]
+        return sorted((kd for kd in found if kd[1] <= max_distance), key=lambda kd: kd[1])
+
+    def check(self, key, fp):
+        """'unchanged' if key's own previous fingerprint is near fp,
+        ('mirror', other_key) if another key's is, else None."""
+        previous = self.get(key)
+        if previous is not None and hamming(previous, fp) <= self.max_distance:
+            return 'unchanged'
+        for other, _ in self.near(fp):
+            if other != key:
+                return ('mirror', other)
+        return None
@@ -0,0 +1,319 @@
+import os
+import re
+import json
+import time
+import zlib
+import threading
+import logging
+from functools import lru_cache
+from itertools import chain
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+logger = logging.getLogger('VectorIndex')
+
+INDEX_DIR = os.getenv("MINI_VECTOR_DIR",
+                      os.path.join(os.path.dirname(os.path.abspath(__file__)), "vector_index"))
+DIM = 256
+CHUNK_WORDS = 80
+CHUNK_OVERLAP = 20
+BLOCK_ROWS = 65536  # rows scored per matmul so float32 temporaries stay small
+MIN_SCORE = 0.2  # cosine similarity below this is not a match
+COMPACT_RATIO = 0.3  # compact once this fraction of rows is dead
+# float32 copy of the matrix kept in RAM for fast matmuls; rows past it are converted per query
+RESIDENT_MB = int(os.getenv("MINI_VECTOR_CACHE_MB", "128"))
+WORD_RE = re.compile(r'\w+')
+
+
+def chunk_text(text, words=CHUNK_WORDS, overlap=CHUNK_OVERLAP):
+    """Overlapping word windows of text"""
+    tokens = text.split()
+    if not tokens:
+        return []
+    step = max(1, words - overlap)
+    return [' '.join(tokens[i:i + words]) for i in range(0, max(1, len(tokens) - overlap), step)]
+
+
+def _slot(feature):
+    """Signed hash bucket: b >= 0 adds to column b, b < 0 subtracts from column -b - 1"""
+    h = zlib.crc32(feature.encode('utf-8'))
+    return h % DIM if h & 0x80000000 else -(h % DIM) - 1
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_slots(word):
+    """Buckets of a word and its character trigrams"""
+    padded = f"#{word}#"
+    return (_slot(word),) + tuple(_slot(padded[i:i + 3]) for i in range(len(padded) - 2))
+
+
+@lru_cache(maxsize=1 << 18)
+def _pair_slot(first, second):
+    return _slot(f"{first} {second}")
+
+
+def embed(texts):
+    """L2-normalised hashed vectors of words, word bigrams and character trigrams"""
+    matrix = np.zeros((len(texts), DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = WORD_RE.findall(text.lower())
+        slots = np.fromiter(chain(chain.from_iterable(map(_word_slots, words)),
+                                  map(_pair_slot, words, words[1:])), dtype=np.int64)
+        positive = slots >= 0
+        matrix[row] = (np.bincount(slots[positive], minlength=DIM)
+                       - np.bincount(-slots[~positive] - 1, minlength=DIM))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    """Semantic index over chunks of crawled page text.
+
+    vectors.f16 is a raw float16 matrix (one DIM-wide row per chunk) read
+    through np.memmap; chunks.jsonl holds each row's url, category, time
+    and text, plus {"delete": url} tombstones written when a page is
+    re-added. Appends only ever extend both files; compact() rewrites them
+    without dead rows. In memory there is only per-row metadata, the text
+    offsets and a bounded float32 copy of the leading rows for scoring.
+    """
+
+    def __init__(self, index_dir=INDEX_DIR, resident_mb=RESIDENT_MB):
+        self.index_dir = index_dir
+        self.vectors_path = os.path.join(index_dir, "vectors.f16")
+        self.chunks_path = os.path.join(index_dir, "chunks.jsonl")
+        self.resident_cap = resident_mb * 1024 * 1024 // (DIM * 4)
+        os.makedirs(index_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._load()
+
+    # ---------------- STORAGE ----------------
+    def _load(self):
+        self.urls = []
+        self.offsets = []  # byte offset of each row's record in chunks.jsonl
+        self.by_url = {}
+        self._category_ids = {}
+        self._category_names = []
+        categories, times = [], []
+        dead = set()
+        if os.path.exists(self.chunks_path):
+            with open(self.chunks_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    record = json.loads(line)
+                    if "delete" in record:
+                        dead.update(self.by_url.pop(record["delete"], ()))
+                    else:
+                        self.by_url.setdefault(record["url"], []).append(len(self.urls))
+                        self.urls.append(record["url"])
+                        self.offsets.append(offset)
+                        categories.append(self._category_id(record.get("category")))
+                        times.append(record["t"])
+                    offset += len(line)
+        n = self._vector_rows()
+        if n != len(self.urls):
+            # Crash between the two appends: trust the shorter of the two
+            logger.warning(f"Vector index out of sync ({n} vectors, {len(self.urls)} chunks); truncating")
+            n = min(n, len(self.urls))
+            del self.urls[n:], self.offsets[n:], categories[n:], times[n:]
+            self.by_url = {}
+            for row, url in enumerate(self.urls):
+                self.by_url.setdefault(url, []).append(row)
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(n * DIM * 2)
+        self.categories = np.array(categories, dtype=np.int32)
+        self.indexed_at = np.array(times, dtype=np.float64)
+        self.alive = np.ones(len(self.urls), dtype=bool)
+        self.alive[[row for row in dead if row < len(self.urls)]] = False
+        self._matrix = None
+        self._resident = None
+        self._resident_rows = 0
+
+    def _category_id(self, category):
+        if category not in self._category_ids:
+            self._category_ids[category] = len(self._category_names)
+            self._category_names.append(category)
+        return self._category_ids[category]
+
+    def _vector_rows(self):
+        try:
+            return os.path.getsize(self.vectors_path) // (DIM * 2)
+        except OSError:
+            return 0
+
+    def _get_matrix(self):
+        if self._matrix is None and self.urls:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float16, mode="r",
+                                     shape=(len(self.urls), DIM))
+        return self._matrix
+
+    def _fill_resident(self, matrix):
+        """Convert rows not yet in the float32 copy, up to resident_cap"""
+        target = min(len(self.urls), self.resident_cap)
+        if self._resident_rows >= target:
+            return
+        if self._resident is None or len(self._resident) < target:
+            # Grow geometrically so appends don't copy the whole buffer each time
+            size = min(self.resident_cap, max(target, 2 * self._resident_rows))
+            grown = np.empty((size, DIM), dtype=np.float32)
+            if self._resident_rows:
+                grown[:self._resident_rows] = self._resident[:self._resident_rows]
+            self._resident = grown
+        for start in range(self._resident_rows, target, BLOCK_ROWS):
+            end = min(target, start + BLOCK_ROWS)
+            self._resident[start:end] = matrix[start:end]
+        self._resident_rows = target
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    # ---------------- WRITE ----------------
+    def add_page(self, url, text, category=None):
+        """Replace url's chunks with chunks of text. Returns the number added."""
+        return self.add_pages([(url, text, category)])
+
+    def add_pages(self, pages):
+        """Append chunks for several (url, text, category) pages in one go"""
+        pending = []
+        for url, text, category in pages:
+            pending += [(url, category, chunk) for chunk in chunk_text(text)]
+        vectors = embed([chunk for _, _, chunk in pending]).astype(np.float16) if pending else None
+        now = time.time()
+        with self._lock:
+            with open(self.chunks_path, "ab") as meta:
+                for url in dict.fromkeys(url for url, _, _ in pages):
+                    rows = self.by_url.pop(url, None)
+                    if rows:
+                        meta.write((json.dumps({"delete": url}) + "\n").encode("utf-8"))
+                        self.alive[rows] = False
+                offset = meta.tell()
+                categories = []
+                for url, category, chunk in pending:
+                    line = (json.dumps({"url": url, "category": category, "t": now, "text": chunk},
+                                       ensure_ascii=False) + "\n").encode("utf-8")
+                    meta.write(line)
+                    self.by_url.setdefault(url, []).append(len(self.urls))
+                    self.urls.append(url)
+                    self.offsets.append(offset)
+                    categories.append(self._category_id(category))
+                    offset += len(line)
+            if pending:
+                with open(self.vectors_path, "ab") as f:
+                    f.write(vectors.tobytes())
+                self.categories = np.concatenate([self.categories, np.array(categories, dtype=np.int32)])
+                self.indexed_at = np.concatenate([self.indexed_at, np.full(len(pending), now)])
+                self.alive = np.concatenate([self.alive, np.ones(len(pending), dtype=bool)])
+                self._matrix = None  # existing resident rows stay valid: the file only grew
+            dead = len(self.urls) - len(self)
+            if dead > 1000 and dead > COMPACT_RATIO * len(self.urls):
+                self.compact()
+        return len(pending)
+
+    def compact(self):
+        """Rewrite both files without dead rows"""
+        with self._lock:
+            live = np.nonzero(self.alive)[0]
+            matrix = self._get_matrix()
+            tmp_vectors = f"{self.vectors_path}.tmp"
+            tmp_chunks = f"{self.chunks_path}.tmp"
+            with open(tmp_vectors, "wb") as vf:
+                for start in range(0, len(live), BLOCK_ROWS):
+                    vf.write(np.ascontiguousarray(matrix[live[start:start + BLOCK_ROWS]]).tobytes())
+            with open(self.chunks_path, "rb") as src, open(tmp_chunks, "wb") as dst:
+                for row in live:
+                    src.seek(self.offsets[row])
+                    dst.write(src.readline())
+            self._matrix = None
+            del matrix
+            os.replace(tmp_vectors, self.vectors_path)
+            os.replace(tmp_chunks, self.chunks_path)
+            removed = len(self.urls) - len(live)
+            self._load()
+            logger.info(f"Compacted vector index: removed {removed} dead chunks, {len(self.urls)} left")
+
+    # ---------------- SEARCH ----------------
+    def _chunk_text(self, row):
+        with open(self.chunks_path, "rb") as f:
+            f.seek(self.offsets[row])
+            return json.loads(f.readline())["text"]
+
+    def search_many(self, queries, k=5, category=None, max_age=None, min_score=MIN_SCORE):
+        """Top-k chunks for each query, best first, at most one per url.
+
+        All queries are scored together: each block of the matrix is
+        multiplied against the whole query batch, and argpartition keeps
+        the block's candidates without sorting every row.
+        """
+        if not queries:
+            return []
+        q = embed(queries).T  # DIM x m
+        with self._lock:
+            matrix = self._get_matrix()
+            if matrix is None:
+                return [[] for _ in queries]
+            self._fill_resident(matrix)
+            mask = self.alive.copy()
+            if category is not None:
+                mask &= self.categories == self._category_ids.get(category, -1)
+            if max_age is not None:
+                mask &= self.indexed_at >= time.time() - max_age
+
+            keep = k * 4  # extra candidates so per-url dedupe still leaves k
+            cand_rows, cand_scores = [], []
+            for start in range(0, len(self.urls), BLOCK_ROWS):
+                end = min(len(self.urls), start + BLOCK_ROWS)
+                if end <= self._resident_rows:
+                    block = self._resident[start:end] @ q
+                else:
+                    block = np.asarray(matrix[start:end], dtype=np.float32) @ q  # rows x m
+                block[~mask[start:end]] = -np.inf
+                if len(block) > keep:
+                    idx = np.argpartition(-block, keep - 1, axis=0)[:keep]
+                else:
+                    idx = np.broadcast_to(np.arange(len(block))[:, None], block.shape)
+                cand_rows.append(idx + start)
+                cand_scores.append(np.take_along_axis(block, idx, axis=0))
+            cand_rows = np.concatenate(cand_rows)
+            cand_scores = np.concatenate(cand_scores)
+
+            results = []
+            for j in range(len(queries)):
+                hits, seen = [], set()
+                for pos in np.argsort(-cand_scores[:, j]):
+                    score = float(cand_scores[pos, j])
+                    if score < min_score:
+                        break
+                    row = int(cand_rows[pos, j])
+                    url = self.urls[row]
+                    if url in seen:
+                        continue
+                    seen.add(url)
+                    hits.append({"url": url, "text": self._chunk_text(row),
+                                 "category": self._category_names[self.categories[row]],
+                                 "score": score, "indexed_at": float(self.indexed_at[row]),
+                                 "source": "vector"})
+                    if len(hits) == k:
+                        break
+                results.append(hits)
+        return results
+
+    def search(self, query, k=5, category=None, max_age=None, min_score=MIN_SCORE):
+        return self.search_many([query], k=k, category=category, max_age=max_age, min_score=min_score)[0]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_vector_index():
+    """Shared VectorIndex, or None when NumPy is not installed"""
+    global _index
+    if not HAS_NUMPY:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = VectorIndex()
+        return _index
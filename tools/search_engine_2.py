@@ -1,4 +1,7 @@
 import os
+import json
+import time
+import threading
 import requests
 import logging
 from typing import Dict, List, Any, Optional
@@ -11,6 +14,13 @@ logger = logging.getLogger('SearchEngine2')
 NEWS_API_KEY = os.getenv("NEWS_API_KEY", "75fc0191afbb48cfa6511bbc6189ccc4")
 WEATHER_API_KEY = os.getenv("WEATHER_API_KEY", "c0d1498a293d1724cff35cd9b34d230d")
 
+# Background snapshot of high-frequency queries (news + watched cities)
+SNAPSHOT_PATH = os.getenv("MINI_SNAPSHOT_PATH", os.path.join("data", "search_snapshot.json"))
+SNAPSHOT_REFRESH_ENABLED = os.getenv("MINI_SNAPSHOT_REFRESH", "0") == "1"
+SNAPSHOT_INTERVAL = int(os.getenv("MINI_SNAPSHOT_INTERVAL", "900"))  # seconds
+SNAPSHOT_MAX_AGE = int(os.getenv("MINI_SNAPSHOT_MAX_AGE", "3600"))  # seconds
+WATCHED_CITIES = [c.strip().lower() for c in os.getenv("MINI_WATCHED_CITIES", "delhi,mumbai").split(",") if c.strip()]
+
 # Try to import Wikipedia with fallback
 try:
     import wikipedia
@@ -19,32 +29,177 @@ except ImportError:
     HAS_WIKIPEDIA = False
     logger.warning("Wikipedia package not installed. Using REST API fallback.")
 
+from tools.search_engine.vector_index import get_vector_index
+
+# ---------------- LOCAL INDEX ----------------
+def _local_search(topic: str, k: int = 3) -> List[Dict[str, Any]]:
+    """Best-matching chunks of crawled pages from the local vector index"""
+    vectors = get_vector_index()
+    if vectors is None:
+        return []
+    try:
+        hits = vectors.search(topic, k=k)
+    except Exception as e:
+        logger.error(f"Local index search error: {e}")
+        return []
+    return [{
+        "snippet": hit["text"][:300],
+        "url": hit["url"],
+        "source": "Local index"
+    } for hit in hits]
+
+# ---------------- LIVE FETCHERS ----------------
+def _fetch_news() -> List[Dict[str, Any]]:
+    """Fetch top Indian headlines from NewsAPI"""
+    url = f"https://newsapi.org/v2/top-headlines?country=in&apiKey={NEWS_API_KEY}"
+    response = requests.get(url, timeout=10)
+    response.raise_for_status()
+    
+    data = response.json()
+    articles = data.get("articles", [])
+    
+    if not articles:
+        return [{"snippet": "No latest news found.", "url": ""}]
+    
+    results = []
+    for article in articles[:5]:
+        results.append({
+            "snippet": article.get("title", "No title"),
+            "url": article.get("url", ""),
+            "source": "NewsAPI"
+        })
+    return results
+
+def _fetch_weather(city: str) -> List[Dict[str, Any]]:
+    """Fetch current weather for a city from OpenWeatherMap"""
+    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={WEATHER_API_KEY}&units=metric"
+    response = requests.get(url, timeout=10)
+    response.raise_for_status()
+    
+    data = response.json()
+    if data.get("cod") != 200:
+        return [{"snippet": f"Could not fetch weather for {city}.", "url": ""}]
+    
+    desc = data["weather"][0]["description"]
+    temp = data["main"]["temp"]
+    humidity = data["main"]["humidity"]
+    
+    weather_info = f"Weather in {city.title()}: {desc}, Temperature: {temp}°C, Humidity: {humidity}%"
+    return [{"snippet": weather_info, "url": "", "source": "OpenWeatherMap"}]
+
+# ---------------- LOCAL SNAPSHOT ----------------
+_snapshot: Dict[str, Dict[str, Any]] = {}
+_snapshot_lock = threading.Lock()
+_snapshot_loaded = False
+_refresh_thread: Optional[threading.Thread] = None
+
+def _load_snapshot():
+    global _snapshot, _snapshot_loaded
+    with _snapshot_lock:
+        if _snapshot_loaded:
+            return
+        _snapshot_loaded = True
+        if os.path.exists(SNAPSHOT_PATH):
+            try:
+                with open(SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+                    _snapshot = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading search snapshot: {e}")
+
+def _save_snapshot():
+    with _snapshot_lock:
+        data = dict(_snapshot)
+    try:
+        directory = os.path.dirname(SNAPSHOT_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = SNAPSHOT_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except Exception as e:
+        logger.error(f"Error saving search snapshot: {e}")
+
+def _format_age(seconds: float) -> str:
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    return f"{int(seconds // 3600)} h ago"
+
+def _has_results(results: List[Dict[str, Any]]) -> bool:
+    """Real API results carry a source; placeholders like "No latest news found." don't"""
+    return bool(results) and all(r.get("source") for r in results)
+
+def _snapshot_get(key: str) -> Optional[List[Dict[str, Any]]]:
+    """Return snapshot results for key with their age attached, if fresh enough"""
+    _load_snapshot()
+    with _snapshot_lock:
+        entry = _snapshot.get(key)
+    if not entry or not _has_results(entry["results"]):
+        return None
+    age = time.time() - entry["fetched_at"]
+    if age > SNAPSHOT_MAX_AGE:
+        return None
+    results = [dict(r) for r in entry["results"]]
+    if results:
+        results[0]["snippet"] = f"{results[0]['snippet']} (updated {_format_age(age)})"
+    for r in results:
+        r["age"] = int(age)
+    return results
+
+def refresh_snapshot(cities: Optional[List[str]] = None):
+    """Fetch headlines and watched-city weather into the local snapshot"""
+    _load_snapshot()
+    jobs = [("news", _fetch_news)]
+    for city in (cities if cities is not None else WATCHED_CITIES):
+        jobs.append((f"weather:{city}", lambda c=city: _fetch_weather(c)))
+    
+    for key, fetch in jobs:
+        try:
+            results = fetch()
+        except Exception as e:
+            logger.error(f"Snapshot refresh failed for {key}: {e}")
+            continue
+        if not _has_results(results):
+            logger.warning(f"Snapshot refresh for {key} returned no results; keeping the previous entry")
+            continue
+        with _snapshot_lock:
+            _snapshot[key] = {"fetched_at": time.time(), "results": results}
+    _save_snapshot()
+
+def start_snapshot_refresh(interval: Optional[int] = None, cities: Optional[List[str]] = None,
+                           force: bool = False) -> bool:
+    """Start the background refresh scheduler. Disabled unless MINI_SNAPSHOT_REFRESH=1 or force."""
+    global _refresh_thread
+    if not (SNAPSHOT_REFRESH_ENABLED or force):
+        return False
+    if _refresh_thread and _refresh_thread.is_alive():
+        return True
+    interval = interval or SNAPSHOT_INTERVAL
+    
+    def loop():
+        while True:
+            started = time.time()
+            refresh_snapshot(cities)
+            time.sleep(max(1, interval - (time.time() - started)))
+    
+    _refresh_thread = threading.Thread(target=loop, name="search-snapshot", daemon=True)
+    _refresh_thread.start()
+    logger.info(f"Snapshot refresh every {interval}s for news + {cities or WATCHED_CITIES}")
+    return True
+
 def api_search(query: str) -> List[Dict[str, Any]]:
     query = query.lower().strip()
-    results = []
 
     try:
         # 1. NEWS
         if "news" in query or "समाचार" in query or "खबर" in query:
             logger.info(f"Processing news query: {query}")
-            url = f"https://newsapi.org/v2/top-headlines?country=in&apiKey={NEWS_API_KEY}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            articles = data.get("articles", [])
-            
-            if not articles:
-                return [{"snippet": "No latest news found.", "url": ""}]
-            
-            for article in articles[:5]:
-                results.append({
-                    "snippet": article.get("title", "No title"),
-                    "url": article.get("url", ""),
-                    "source": "NewsAPI"
-                })
-            
-            return results
+            cached = _snapshot_get("news")
+            if cached:
+                return cached
+            return _fetch_news()
 
         # 2. WEATHER
         elif "weather" in query or "mausam" in query or "मौसम" in query:
@@ -54,20 +209,10 @@ def api_search(query: str) -> List[Dict[str, Any]]:
             if not city:
                 return [{"snippet": "Please specify a city name for weather information.", "url": ""}]
             
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={WEATHER_API_KEY}&units=metric"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data.get("cod") != 200:
-                return [{"snippet": f"Could not fetch weather for {city}.", "url": ""}]
-            
-            desc = data["weather"][0]["description"]
-            temp = data["main"]["temp"]
-            humidity = data["main"]["humidity"]
-            
-            weather_info = f"Weather in {city.title()}: {desc}, Temperature: {temp}°C, Humidity: {humidity}%"
-            return [{"snippet": weather_info, "url": "", "source": "OpenWeatherMap"}]
+            cached = _snapshot_get(f"weather:{city}")
+            if cached:
+                return cached
+            return _fetch_weather(city)
 
         # 3. WIKIPEDIA (default)
         else:
@@ -104,6 +249,9 @@ def api_search(query: str) -> List[Dict[str, Any]]:
                     
             except Exception as e:
                 logger.error(f"Wikipedia search error: {e}")
+                local = _local_search(topic)
+                if local:
+                    return local
                 return [{"snippet": f"Could not find information about '{topic}'.", "url": ""}]
 
     except requests.RequestException as e: